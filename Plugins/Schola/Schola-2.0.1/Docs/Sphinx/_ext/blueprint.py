@@ -11,6 +11,10 @@ import sphinx
 from docutils import nodes
 from sphinx.writers.html5 import HTML5Translator
 from docutils.parsers.rst import directives
+from sphinx.util import logging
+from blueprint_cache import load_blueprint_cached
+
+logger = logging.getLogger(__name__)
 
 class blueprint(nodes.General, nodes.Element):
     pass
@@ -30,15 +34,17 @@ class BlueprintDirective(SphinxDirective):
     }
     
     def run(self) -> list[nodes.Node]: 
-        if ("html" in self.env.app.builder.name):
-            height = self.options["height"] if "height" in self.options else 500
-            zoom = self.options["zoom"] if "zoom" in self.options else 0
-            heading = self.options["heading"] if "heading" in self.options else ""
-            imagefallback = self.options["imagefallback"] if "imagefallback" in self.options else None
+        if self.env.app._schola_is_html:
+            opts = self.options
+            height = opts.get("height", 500)
+            zoom = opts.get("zoom", 0)
+            heading = opts.get("heading", "")
+            imagefallback = opts.get("imagefallback")
             return [blueprint(code="\n".join(self.content),height=height,imagefallback=imagefallback,zoom=zoom,heading=heading)]
         else:
-            if "imagefallback" in self.options:
-                return [nodes.image(uri=self.options["imagefallback"])]
+            imagefallback = self.options.get("imagefallback")
+            if imagefallback is not None:
+                return [nodes.image(uri=imagefallback)]
             else:
                 return []
 
@@ -55,48 +61,60 @@ class BlueprintFileDirective(SphinxDirective):
     }
     
     def run(self) -> list[nodes.Node]: 
-        bp_dir = self.env.app.confdir / Path(self.env.app.config.blueprint_dir)
-        file_path = bp_dir / Path(self.arguments[0])
-        if ("html" in self.env.app.builder.name) and file_path.exists():
-            height = self.options["height"] if "height" in self.options else 500
-            zoom = self.options["zoom"] if "zoom" in self.options else 0
-            heading = self.options["heading"] if "heading" in self.options else ""
-            imagefallback = self.options["imagefallback"] if "imagefallback" in self.options else None
-            code = ""
-            with open(file_path) as file:
-                code = file.readlines()
-                #remove any rst comments
-                code = "\n".join(filter(lambda x: not ".. " in x, code))
+        app = self.env.app
+        file_path = app._schola_bp_dir / Path(self.arguments[0])
+        if app._schola_is_html and file_path.exists():
+            opts = self.options
+            height = opts.get("height", 500)
+            zoom = opts.get("zoom", 0)
+            heading = opts.get("heading", "")
+            imagefallback = opts.get("imagefallback")
+            code = load_blueprint_cached(file_path, app._schola_bp_cache_dir)
             #empty bp on fail to load
             return [blueprint(code=code,height=height,imagefallback=imagefallback,zoom=zoom,heading=heading)]
         else:
-            if "imagefallback" in self.options:
-                return [nodes.image(uri=self.options["imagefallback"])]
+            imagefallback = self.options.get("imagefallback")
+            if imagefallback is not None:
+                return [nodes.image(uri=imagefallback)]
             else:
                 return []
 
 
-def visit_blueprint_node(self : HTML5Translator, node: blueprint):
-    html_node = f"""<style>
-        #ueb-id-{visit_blueprint_node.id} {{
-            --ueb-height: {node.attributes["height"]}px;
+_BP_TEMPLATE = """<style>
+        #ueb-id-{id} {{
+            --ueb-height: {height}px;
         }}
         template {{
             display : block
         }}
     </style>
-    <ueb-blueprint data-number-id="{visit_blueprint_node.id}" data-heading="{node.attributes["heading"].replace(">"," ❯ ")}" data-zoom="{node.attributes["zoom"]}" id="ueb-id-{visit_blueprint_node.id}">
-        <template id="template-id-{visit_blueprint_node.id}">
-            {node.attributes["code"]}
+    <ueb-blueprint data-number-id="{id}" data-heading="{display_heading}" data-zoom="{zoom}" id="ueb-id-{id}">
+        <template id="template-id-{id}">
+            {code}
     """
-    if node.attributes["imagefallback"] != None:
-        print(node.attributes["imagefallback"])
-        html_node = f"""<noscript>  
-            <img src="{node.attributes["imagefallback"]}" alt="{node.attributes["heading"]} Fallback Image">  
-        </noscript>""" + html_node
+
+_BP_FALLBACK_TEMPLATE = """<noscript>  
+            <img src="{imagefallback}" alt="{heading} Fallback Image">  
+        </noscript>"""
+
+def visit_blueprint_node(self : HTML5Translator, node: blueprint):
+    attributes = node.attributes
+    # serial numbers live on the build environment, so parallel writers don't share a module level counter
+    node_id = self.builder.env.new_serialno("blueprint")
+    fields = {
+        "id": node_id,
+        "height": attributes["height"],
+        "heading": attributes["heading"],
+        "display_heading": attributes["heading"].replace(">"," ❯ "),
+        "zoom": attributes["zoom"],
+        "code": attributes["code"],
+        "imagefallback": attributes["imagefallback"],
+    }
+    html_node = _BP_TEMPLATE.format_map(fields)
+    if attributes["imagefallback"] != None:
+        logger.debug("blueprint fallback image: %s", attributes["imagefallback"])
+        html_node = _BP_FALLBACK_TEMPLATE.format_map(fields) + html_node
     self.body.append(html_node)
-    visit_blueprint_node.id += 1
-visit_blueprint_node.id = 0 #it could break if sphinx imports the plugin multiple times etc.
 
 def depart_blueprint_node(self : HTML5Translator, node: blueprint):
     self.body.append("""
@@ -106,21 +124,24 @@ def depart_blueprint_node(self : HTML5Translator, node: blueprint):
 
 
 
-class BlueprintNodeSearcher(nodes.SparseNodeVisitor):
+def resolve_build_settings(app: Sphinx):
+    # the builder and config are fixed for the whole build, so resolve them once for the directives
+    app._schola_is_html = "html" in app.builder.name
+    app._schola_bp_dir = Path(app.confdir) / Path(app.config.blueprint_dir)
+    cache_dir = app.config.blueprint_cache_dir
+    app._schola_bp_cache_dir = Path(cache_dir) if cache_dir is not None else Path(app.doctreedir) / "blueprint-cache"
 
-    def visit_blueprint(self, node):
-        self.found_bp_node = True
-        raise nodes.NodeFound(node)
+_BP_JS_BODY = 'import { Blueprint } from "/_static/ueblueprint.js"'
+_BP_CSS_FILE = "css/ueb-style.css"
 
 def update_context(app: Sphinx, pagename, templatename, context, doctree):
     if doctree is None:
         return
-    try:
-        searcher = BlueprintNodeSearcher(doctree)
-        doctree.walk(searcher)
-    except nodes.NodeFound:
-        app.add_js_file(filename=None,type="module",body='import { Blueprint } from "/_static/ueblueprint.js"')
-        app.add_css_file(filename="css/ueb-style.css")
+    # next_node stops at the first match rather than walking the whole tree
+    # assets added during html-page-context only apply to the current page, so they are added for each page that needs them
+    if doctree.next_node(blueprint) is not None:
+        app.add_js_file(filename=None,type="module",body=_BP_JS_BODY)
+        app.add_css_file(filename=_BP_CSS_FILE)
     
 def setup(app: Sphinx) -> ExtensionMetadata:
     
@@ -128,6 +149,8 @@ def setup(app: Sphinx) -> ExtensionMetadata:
     app.add_directive('blueprint', BlueprintDirective)
     app.add_directive('blueprint-file', BlueprintFileDirective)
     app.add_config_value('blueprint_dir', Path('./blueprints'), 'env', [Path,str])
+    # None means <doctreedir>/blueprint-cache, which is kept out of the published output
+    app.add_config_value('blueprint_cache_dir', None, '', [Path,str])
 
     # link our extension static files to the output page
     static_dir = Path(__file__).parent / "static"
@@ -136,6 +159,7 @@ def setup(app: Sphinx) -> ExtensionMetadata:
         (lambda app: app.config.html_static_path.append(static_dir.as_posix())),
     )
 
+    app.connect("builder-inited", resolve_build_settings)
     app.connect("html-page-context", update_context)
     
     return {
@@ -0,0 +1,40 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+# bump when filter_blueprint_lines changes so stale cache entries are not reused
+CACHE_VERSION = b"2"
+
+def filter_blueprint_lines(data: bytes) -> str:
+    #remove any rst comments, filtering on bytes and decoding once at the end
+    code = b"".join(
+        line for line in data.splitlines(keepends=True) if not line.lstrip().startswith(b".. ")
+    ).decode("utf-8")
+    return code.replace("\r\n", "\n").replace("\r", "\n")
+
+def load_blueprint_cached(path: Path, cache_dir: Path) -> str:
+    """
+    Load a blueprint file with rst comments removed, reusing the filtered text from a previous build when the file contents are unchanged.
+    """
+    path = Path(path)
+    cache_dir = Path(cache_dir)
+    data = path.read_bytes()
+    key = hashlib.sha256(CACHE_VERSION + data).hexdigest()[:16]
+    cached = cache_dir / f"{key}.txt"
+    if cached.exists():
+        return cached.read_text(encoding="utf-8")
+    code = filter_blueprint_lines(data)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file and rename it into place, so a parallel reader never sees a partially written entry
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(code)
+        os.replace(tmp_path, cached)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return code
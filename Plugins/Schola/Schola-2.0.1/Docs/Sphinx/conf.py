@@ -34,7 +34,7 @@ extensions = [
 # autosectionlabel_prefix_document = True
 
 templates_path = ['_templates']
-exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store']
+exclude_patterns = ['_build', '_includes', 'Thumbs.db', '.DS_Store']
 
 language = 'en'
 
@@ -71,7 +71,10 @@ PYTHON_VERSION = "Python 3.9 to 3.12 "
 UNREAL_VERSION = "Unreal Engine 5.6"
 UNREAL_VERSION_EXACT = "5.6.1"
 
-rst_prolog =f"""
+# Substitutions shared by the setup guides. Rather than prepending these to every source file through
+# rst_prolog, they are written to _includes/prolog.rst and pulled in with ``.. include:: /_includes/prolog.rst``
+# by the pages that use them.
+substitutions_rst = f"""
 .. |py_version| replace:: {PYTHON_VERSION} 
 .. _`py_version`: https://www.python.org/downloads/release/python-3919/
 
@@ -97,6 +100,13 @@ rst_prolog =f"""
 .. |vs_version| replace:: (Visual Studio Professional 2022 (64-bit) - LTSC 17.8 is recommended for reproducibility)
 """
 
+# only rewrite when the text changes, so the including pages are not marked outdated on every build
+from pathlib import Path
+_prolog_path = Path(__file__).parent / "_includes" / "prolog.rst"
+if not _prolog_path.exists() or _prolog_path.read_text(encoding="utf-8") != substitutions_rst:
+    _prolog_path.parent.mkdir(exist_ok=True)
+    _prolog_path.write_text(substitutions_rst, encoding="utf-8")
+
 # -- Options for todo extension ----------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/extensions/todo.html#configuration
 
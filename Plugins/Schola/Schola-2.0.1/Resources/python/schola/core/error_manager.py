@@ -7,6 +7,11 @@ import grpc
 import abc
 from contextlib import ContextDecorator
 
+# details messages gRPC reports for the errors wrapped below
+_NO_SERVER_DETAILS_PREFIX = "failed to connect to all addresses"
+_CANCELLED_DETAILS = "Cancelling all calls"
+_STREAM_REMOVED_DETAILS = "Stream removed"
+
 
 class ScholaException(Exception):
     """
@@ -21,6 +26,9 @@ class WrappedGRPCException(ScholaException, metaclass=abc.ABCMeta):
     Base class for all Schola exceptions that wrap GRPC exceptions, to add more information.
     """
 
+    #: The status codes of the gRPC errors this exception can describe, empty to be checked against every error.
+    status_codes = ()
+
     @classmethod
     @abc.abstractmethod
     def comes_from(cls, exception): ...
@@ -39,11 +47,13 @@ class NoServerError(WrappedGRPCException):
             "No Server detected. Is Unreal Running? If it is, have you hit begin play?"
         )
 
+    status_codes = (grpc.StatusCode.UNAVAILABLE,)
+
     @classmethod
     def comes_from(cls, exception):
         return (
             exception.code() == grpc.StatusCode.UNAVAILABLE
-            and exception.details().startswith("failed to connect to all addresses")
+            and exception.details().startswith(_NO_SERVER_DETAILS_PREFIX)
         )
 
 
@@ -58,16 +68,22 @@ class UnrealCrashedError(WrappedGRPCException):
     def __str__(self):
         return "It looks like Unreal has stopped responding. Did you stop the running game?"
 
+    status_codes = (
+        grpc.StatusCode.CANCELLED,
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.UNKNOWN,
+    )
+
     @classmethod
     def comes_from(cls, exception):
         code_cancelled = exception.code() == grpc.StatusCode.CANCELLED
         details_cancelled = (
             exception.code() == grpc.StatusCode.UNAVAILABLE
-            and exception.details() == "Cancelling all calls"
+            and exception.details() == _CANCELLED_DETAILS
         )
         stream_cancelled = (
             exception.code() == grpc.StatusCode.UNKNOWN
-            and exception.details() == "Stream removed"
+            and exception.details() == _STREAM_REMOVED_DETAILS
         )
         return code_cancelled or details_cancelled or stream_cancelled
 
@@ -83,6 +99,8 @@ class MissingMethodError(WrappedGRPCException):
     def __str__(self):
         return "Expected an endpoint to exist in unreal but it doesn't. Check that your environment is configured correctly."
 
+    status_codes = (grpc.StatusCode.UNIMPLEMENTED,)
+
     @classmethod
     def comes_from(cls, exception):
         return exception.code() == grpc.StatusCode.UNIMPLEMENTED
@@ -100,6 +118,21 @@ class EnvironmentException(ScholaException):
 ALL_EXCEPTIONS = [NoServerError, UnrealCrashedError, MissingMethodError]
 
 
+def _exceptions_by_status_code(exceptions):
+    # the exceptions that can describe an error with each status code, in the same priority order as `exceptions`
+    return {
+        code: tuple(
+            exception_class
+            for exception_class in exceptions
+            if not exception_class.status_codes or code in exception_class.status_codes
+        )
+        for code in grpc.StatusCode
+    }
+
+
+_EXCEPTIONS_BY_STATUS_CODE = _exceptions_by_status_code(ALL_EXCEPTIONS)
+
+
 class ScholaErrorContextManager(ContextDecorator):
     """
     Wrapper for GRPC that redirects any grpc errors to our own more descriptive custom ones.
@@ -113,8 +146,9 @@ class ScholaErrorContextManager(ContextDecorator):
 
     def __exit__(self, exc_type, exc_value, exc_tb):
         if isinstance(exc_value, grpc.RpcError):
-            # check if it matches any of our current custom exceptions
-            for exception_class in ALL_EXCEPTIONS:
+            # check if it matches any of our current custom exceptions, only trying those that handle its status code
+            code = exc_value.code()
+            for exception_class in _EXCEPTIONS_BY_STATUS_CODE.get(code, ()):
                 if exception_class.comes_from(exc_value):
                     raise exception_class(exc_value) from exc_value
             # re-raise the current exception with false
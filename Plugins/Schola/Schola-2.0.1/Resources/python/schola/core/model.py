@@ -1,8 +1,41 @@
 # Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
 
+import inspect
+import logging
 from typing import Tuple
 import torch as th
 
+logger = logging.getLogger(__name__)
+
+# the dynamo argument to torch.onnx.export was added in torch 2.5
+_ONNX_EXPORT_SUPPORTS_DYNAMO = "dynamo" in inspect.signature(th.onnx.export).parameters
+
+
+def export_onnx(model: th.nn.Module, inputs: Tuple[th.Tensor, ...], export_path: str, **export_kwargs) -> None:
+    """
+    Export a model to ONNX, with the Dynamo based exporter where torch supports it, falling back to the TorchScript based exporter if Dynamo cannot export the model.
+
+    Parameters
+    ----------
+    model : th.nn.Module
+        The model to export.
+    inputs : Tuple[th.Tensor, ...]
+        Example inputs to the model, used to trace it.
+    export_path : str
+        The file path where the ONNX model will be saved.
+    **export_kwargs
+        Additional keyword arguments passed to torch.onnx.export, e.g. the opset version and input names.
+    """
+    if _ONNX_EXPORT_SUPPORTS_DYNAMO:
+        try:
+            th.onnx.export(model, inputs, str(export_path), dynamo=True, **export_kwargs)
+            return
+        except (th.onnx.errors.OnnxExporterError, ImportError) as e:
+            # ImportError covers a missing onnxscript, which the Dynamo exporter needs
+            logger.warning("Dynamo ONNX export failed (%s), falling back to the TorchScript exporter", e)
+        export_kwargs["dynamo"] = False
+    th.onnx.export(model, inputs, str(export_path), **export_kwargs)
+
 
 class ScholaModel(th.nn.Module):
     """
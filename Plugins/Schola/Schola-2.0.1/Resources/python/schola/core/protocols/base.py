@@ -33,6 +33,8 @@ class BaseProtocol:
     This abstract class defines the basic interface for communication protocols
     used to connect Python environments with simulations.
     """
+
+    __slots__ = ()
     
     def close(self) -> None:
         """
@@ -115,6 +117,8 @@ class BaseProtocolMixin:
     protocol implementations via multiple inheritance.
     """
 
+    __slots__ = ()
+
     def on_close(self) -> None:
         """
         Hook called when the protocol is being closed.
@@ -152,6 +156,8 @@ class BaseRLProtocol(BaseProtocol):
     including reset, step, and action messaging.
     """
 
+    __slots__ = ()
+
     
     def send_startup_msg(self, auto_reset_type: AutoResetType = AutoResetType.SAME_STEP):
         """
@@ -237,6 +243,8 @@ class BaseImitationProtocol(BaseProtocol):
     Call GetDefinition to get the environment definition before calling any other methods.
     Call SendStartupMsg to start collecting data.
     """
+
+    __slots__ = ()
     
     def send_startup_msg(self, seeds:Optional[List] = None, options: Optional[List] = None):
         """
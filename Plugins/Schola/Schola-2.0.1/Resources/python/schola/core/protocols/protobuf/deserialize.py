@@ -2,6 +2,7 @@
 
 from functools import singledispatch
 from itertools import tee
+import logging
 from typing import Any, Dict, List, Tuple, Union
 
 import gymnasium.spaces as spaces
@@ -14,6 +15,16 @@ import schola.generated.ImitationConnector_pb2 as imitation_connector_messages
 import numpy as np
 import gymnasium as gym
 import schola.generated.DType_pb2 as proto_dtype
+from google.protobuf.internal import api_implementation
+
+logger = logging.getLogger(__name__)
+
+# every message field access in this module goes through the protobuf runtime, which is far slower in pure Python
+if api_implementation.Type() == "python":
+    logger.warning(
+        "protobuf is using its pure Python implementation, deserializing environment states will be slow. "
+        "Install protobuf>=4.21 and leave PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION unset to use the upb backend."
+    )
 
 PROTO_DTYPE_TO_NUMPY_DTYPE_MAPPING = {
         proto_dtype.DType.FLOAT16 : np.float16,
@@ -185,6 +196,13 @@ def _(msg: state.InitialState) -> Tuple[Dict[int,Dict[str, Any]], Dict[int,Dict[
 
 # State Deserialization
 
+def _unzip_environment_states(environment_states, num_fields: int) -> Tuple[List[Any], ...]:
+    # transpose the per environment tuples into one list per field, zip builds the lists directly
+    # rather than filling lists of placeholder dicts that are immediately replaced
+    if len(environment_states) == 0:
+        return tuple([] for _ in range(num_fields))
+    return tuple(map(list, zip(*map(from_proto, environment_states))))
+
 @from_proto.register
 def _(msg: state.AgentState) -> Tuple[Any,float, bool, bool, Dict[str, str]]:
     observations = from_proto(msg.observations)
@@ -206,14 +224,7 @@ def _(msg: state.EnvironmentState) -> Tuple[Dict[str,Any], Dict[str, float],  Di
 
 @from_proto.register
 def _(msg: state.TrainingState) -> Tuple[List[Dict[str,Any]], List[float],  List[bool], List[bool], List[Dict[str, Dict[str,str]]]]:
-    observations = [{} for _ in range(len(msg.environment_states))]
-    rewards = [{} for _ in range(len(msg.environment_states))]
-    terminateds = [{} for _ in range(len(msg.environment_states))]
-    truncateds = [{} for _ in range(len(msg.environment_states))]
-    infos = [{} for _ in range(len(msg.environment_states))]
-    for env_id, env_state in enumerate(msg.environment_states):
-        observations[env_id], rewards[env_id], terminateds[env_id], truncateds[env_id], infos[env_id] = from_proto(env_state)
-    return observations, rewards, terminateds, truncateds, infos
+    return _unzip_environment_states(msg.environment_states, 5)
 
 # Definition Deserialization
 
@@ -278,15 +289,7 @@ def _(msg: imitation_state_messages.ImitationEnvironmentState) -> Tuple[Dict[str
     
 @from_proto.register
 def _(msg: imitation_state_messages.ImitationTrainingState) -> Tuple[List[Dict[str,Any]], List[Dict[str, float]],  List[Dict[str, bool]], List[Dict[str, bool]], List[Dict[str, Dict[str,str]]], List[Dict[str, Any]]]:
-    observations = [{} for _ in range(len(msg.environment_states))]
-    rewards = [{} for _ in range(len(msg.environment_states))]
-    terminateds = [{} for _ in range(len(msg.environment_states))]
-    truncateds = [{} for _ in range(len(msg.environment_states))]
-    infos = [{} for _ in range(len(msg.environment_states))]
-    actions = [{} for _ in range(len(msg.environment_states))]
-    for env_id, env_state in enumerate(msg.environment_states):
-        observations[env_id], rewards[env_id], terminateds[env_id], truncateds[env_id], infos[env_id], actions[env_id] = from_proto(env_state)
-    return observations, rewards, terminateds, truncateds, infos, actions
+    return _unzip_environment_states(msg.environment_states, 6)
 
 @from_proto.register
 def _(msg: imitation_state_messages.ImitationState) -> Tuple[List[Dict[str,Any]], List[Dict[str, float]],  List[Dict[str, bool]], List[Dict[str, bool]], List[Dict[str, Dict[str,str]]], Dict[int,Dict[str, Any]], Dict[int,Dict[str, str]], List[Dict[str, Any]]]:
@@ -11,12 +11,33 @@ from schola.core.protocols.protobuf.serialize import to_proto, fill_generic
 import schola.generated.ImitationConnector_pb2_grpc as imitation_grpc
 import schola.generated.ImitationConnector_pb2 as imitation_messages
 import schola.generated.ImitationState_pb2 as imitation_state_messages
+from schola.generated.StateUpdates_pb2 import EnvironmentSettings
 from schola.core.protocols.socket import SocketProtocolMixin
 import gymnasium as gym
 import sys
 import logging
 
+# Set max message sizes to 100MB to handle large observation batches, matching gRPCProtocol
+_CHANNEL_OPTIONS = (
+    ('grpc.max_send_message_length', 100 * 1024 * 1024),
+    ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+)
+
+_LOCAL_CREDS: Optional[grpc.ChannelCredentials] = None
+
+def _get_local_creds() -> grpc.ChannelCredentials:
+    """
+    Get the local channel credentials, creating them on first use so reconnecting reuses them.
+    """
+    global _LOCAL_CREDS
+    if _LOCAL_CREDS is None:
+        _LOCAL_CREDS = grpc.local_channel_credentials()
+    return _LOCAL_CREDS
+
 class gRPCImitationProtocol(BaseImitationProtocol, SocketProtocolMixin):
+
+    # slotted along with the base classes so the per-step attribute reads skip the instance __dict__
+    __slots__ = ("channel", "stub", "protocol_start_timeout")
     
     def __init__(self, 
                  url: str, 
@@ -47,12 +68,12 @@ class gRPCImitationProtocol(BaseImitationProtocol, SocketProtocolMixin):
         SocketProtocolMixin.on_start(self)
 
         self.channel = grpc.secure_channel(
-            self.address, grpc.local_channel_credentials()
+            self.address, _get_local_creds(), options=_CHANNEL_OPTIONS
         ).__enter__()
         self.stub = imitation_grpc.ImitationConnectorServiceStub(self.channel)
 
     def send_startup_msg(self, seeds: List = None, options: List = None):
-        start_msg = imitation_messages.ImitationConnectorStartRequest()
+        environments = {}
         
         if not seeds is None or not options is None:
             
@@ -61,14 +82,16 @@ class gRPCImitationProtocol(BaseImitationProtocol, SocketProtocolMixin):
             if options is None:
                 options = [{} for _ in range(len(seeds))]
 
-            # environments is a map, so we populate it like a dictionary
-            for env_id, (seed, option_dict) in enumerate(zip(seeds, options)):
-                env_settings = start_msg.environments[env_id]
-                if seed is not None:
-                    env_settings.seed = seed
-                if option_dict:
-                    for key, value in option_dict.items():
-                        env_settings.options = str(value)
+            # build every environment's settings up front, then fill the map in one go when constructing the request
+            environments = {
+                env_id: EnvironmentSettings(
+                    seed=seed,
+                    options={key: str(value) for key, value in option_dict.items()} if option_dict else None,
+                )
+                for env_id, (seed, option_dict) in enumerate(zip(seeds, options))
+            }
+
+        start_msg = imitation_messages.ImitationConnectorStartRequest(environments=environments)
         
         self.stub.StartImitationConnector(
             start_msg, timeout=self.protocol_start_timeout, wait_for_ready=True
@@ -98,7 +121,7 @@ class gRPCImitationProtocol(BaseImitationProtocol, SocketProtocolMixin):
         bool
             Whether the connection is active or not
         """
-        return self.channel != None
+        return self.channel is not None
 
     def __bool__(self) -> bool:
         """
@@ -109,7 +132,8 @@ class gRPCImitationProtocol(BaseImitationProtocol, SocketProtocolMixin):
         bool
             True iff the connection is active
         """
-        return self.has_socket and self.channel_connected
+        # check the cheap identity test first, the socket check makes a fileno() call
+        return self.channel is not None and self.has_socket
 
     @property
     def properties(self) -> Dict[str,Any]:
@@ -8,6 +8,8 @@ from .base import BaseProtocol, BaseProtocolMixin
 
 class SocketProtocolMixin(BaseProtocolMixin):
 
+    __slots__ = ("url", "port", "tcp_socket")
+
     def __init__(self, url: str, port: int = None):
         self.url = url
         self.port = 0 if port is None else port
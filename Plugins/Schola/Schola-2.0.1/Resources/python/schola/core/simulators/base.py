@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
 
-from functools import singledispatchmethod
-from typing import Any, Dict, Tuple
+from functools import lru_cache, singledispatchmethod
+from typing import Any, Dict, Tuple, Type
 
 from schola.core.protocols.base import BaseProtocol
 
@@ -15,6 +15,11 @@ class UnsupportedProtocolException(Exception):
     pass
 
 
+@lru_cache(maxsize=64)
+def _is_supported_protocol_class(protocol_cls: Type[BaseProtocol], supported_protocols: Tuple[Type[BaseProtocol], ...]) -> bool:
+    return issubclass(protocol_cls, supported_protocols)
+
+
 class BaseSimulator:
     """
     Base class for all simulators.
@@ -56,6 +61,24 @@ class BaseSimulator:
             A tuple of protocol classes that this simulator supports.
         """
         return tuple()
+
+    def supports_protocol(self, protocol: BaseProtocol) -> bool:
+        """
+        Check if a protocol can be used with this simulator.
+
+        The result is cached per (protocol class, supported protocols) pair.
+
+        Parameters
+        ----------
+        protocol : BaseProtocol
+            The protocol to check.
+
+        Returns
+        -------
+        bool
+            True if the protocol is an instance of one of the supported protocols, False otherwise.
+        """
+        return _is_supported_protocol_class(type(protocol), self.supported_protocols)
     
 
     def __bool__(self) -> bool:
@@ -3,7 +3,7 @@
 """
 Utility Functions and Classes for managing environment and agent ids.
 """
-from functools import cached_property, singledispatchmethod
+from functools import cached_property
 from typing import List, Optional, Tuple, TypeVar, Dict, Iterable, Union
 
 K = TypeVar("K")
@@ -14,6 +14,9 @@ T = TypeVar("T")
 # A generic recursive dictionary type
 NestedDict = Dict[K, Union[V, "NestedDict[V]"]]
 
+# sentinel for missing keys, so stored None values are not mistaken for missing ones
+_MISSING = object()
+
 
 def nested_get(dct: NestedDict[K, V], keys: Iterable[K], default: V) -> V:
     """
@@ -35,9 +38,8 @@ def nested_get(dct: NestedDict[K, V], keys: Iterable[K], default: V) -> V:
     """
     curr_dct = dct
     for key in keys:
-        if key in curr_dct:
-            curr_dct = curr_dct[key]
-        else:
+        curr_dct = curr_dct.get(key, _MISSING)
+        if curr_dct is _MISSING:
             return default
     return curr_dct
 
@@ -79,11 +81,7 @@ class IdManager:
         List[T]
             A flattened list of the values found in the dictionary.
         """
-        output_list = [default for i in range(0, self.num_ids)]
-        for first_id, nested_ids in nested_id_dict.items():
-            for second_id, value in nested_ids.items():
-                output_list[self.id_map[first_id][second_id]] = value
-        return output_list
+        return self._scatter(nested_id_dict.items(), default)
 
     def flatten_list_of_dicts(self, nested_id_list: List[Dict[str,T]], default: Optional[T] = None):
         """
@@ -102,12 +100,34 @@ class IdManager:
         List[T]
             A flattened list of the values found in the nested structure. Ordered by UID.
         """
-        output_list = [default for i in range(0, self.num_ids)]
-        for first_id, nested_ids in enumerate(nested_id_list):
+        return self._scatter(enumerate(nested_id_list), default)
+
+    def _scatter(
+        self, nested_items: Iterable[Tuple[int, Dict[str, T]]], default: Optional[T] = None
+    ) -> List[T]:
+        """
+        Write the values of each nested dictionary into a flat list at their flattened ids.
+
+        Parameters
+        ----------
+        nested_items : Iterable[Tuple[int, Dict[str, T]]]
+            Pairs of first id and a dictionary keyed by second id.
+        default : Optional[T], optional
+            The default value to use for ids that are not present, by default None.
+
+        Returns
+        -------
+        List[T]
+            A flattened list of the values, ordered by UID.
+        """
+        output_list = [default] * self.num_ids
+        id_map = self.id_map
+        for first_id, nested_ids in nested_items:
+            env_map = id_map[first_id]
             for second_id, value in nested_ids.items():
-                output_list[self.id_map[first_id][second_id]] = value
+                output_list[env_map[second_id]] = value
         return output_list
-    
+
     def nest_list_to_dict_of_dicts(
         self, id_list: List[T], default: Optional[T] = None
     ) -> Dict[int, Dict[int, T]]:
@@ -125,18 +145,23 @@ class IdManager:
         -------
         Dict[int, Dict[int, T]]
             A nested dictionary of the values in `id_list` or `default` if values are missing.
+
+        Raises
+        ------
+        IndexError
+            If `id_list` has more values than there are ids.
         """
+        if len(id_list) > self.num_ids:
+            raise IndexError(f"Got {len(id_list)} values but there are only {self.num_ids} ids")
         output_dict = {
             first_id: {second_id: default for second_id in nested_ids}
             for first_id, nested_ids in enumerate(self.ids)
         }
-        for flat_id, body in enumerate(id_list):
-            first_id, second_id = self[flat_id]
+        for (first_id, second_id), body in zip(self.id_list, id_list):
             output_dict[first_id][second_id] = body
         return output_dict
 
-    @singledispatchmethod
-    def __getitem__(self, key):
+    def __getitem__(self, key: Union[int, Tuple[int, str]]) -> Union[Tuple[int, str], int]:
         """
         Convert a key into a nested or flattened id, from a flattened or nested id respectively.
 
@@ -155,19 +180,17 @@ class IdManager:
         NotImplementedError
             If the key is not of type int or Tuple[int,int].
         """
+        # exact type checks short circuit the isinstance checks, since this is called per agent in the step loops
+        key_type = type(key)
+        if key_type is int or isinstance(key, int):
+            return self.id_list[key]
+        if key_type is tuple or isinstance(key, tuple):
+            assert len(key) == 2, "if supplying tuple key must supply a key of length 2"
+            return self.id_map[key[0]][key[1]]
         raise NotImplementedError(
             "get item not supported for keys that aren't int or Tuple[int,int]"
         )
 
-    @__getitem__.register
-    def _(self, key: int) -> Tuple[int, str]:
-        return self.id_list[key]
-
-    @__getitem__.register
-    def _(self, key: tuple) -> int:
-        assert len(key) == 2, "if supplying tuple key must supply a key of length 2"
-        return self.id_map[key[0]][key[1]]
-
     def get_nested_id(self, flat_id: int) -> Tuple[int, str]:
         """
         Get the nested id from a flattened id.
@@ -203,20 +226,38 @@ class IdManager:
         return self[first_id, second_id]
 
     @cached_property
-    def id_list(self) -> List[Tuple[int, str]]:
+    def _lookups(self) -> Tuple[List[Tuple[int, str]], List[Dict[str, int]]]:
         """
-        List of nested ids, for lookups from flattened id to nested ids.
+        Build the flattened id lookups in a single pass over the nested ids.
 
         Returns
         -------
-        List[Tuple[int, str]]
-            List of nested ids.
+        Tuple[List[Tuple[int, str]], List[Dict[str, int]]]
+            The values of `id_list` and `id_map`.
         """
         id_list = []
+        id_map = []
+        uid = 0
         for first_id, nested_ids in enumerate(self.ids):
+            env_map = {}
+            id_map.append(env_map)
             for second_id in nested_ids:
+                env_map[second_id] = uid
                 id_list.append((first_id, second_id))
-        return id_list
+                uid += 1
+        return id_list, id_map
+
+    @cached_property
+    def id_list(self) -> List[Tuple[int, str]]:
+        """
+        List of nested ids, for lookups from flattened id to nested ids.
+
+        Returns
+        -------
+        List[Tuple[int, str]]
+            List of nested ids.
+        """
+        return self._lookups[0]
 
     @cached_property
     def id_map(self) -> List[Dict[str, int]]:
@@ -228,13 +269,7 @@ class IdManager:
         List[Dict[int,str]]
             List of dictionaries mapping nested ids to flattened ids.
         """
-        id_map = [{} for first_id in self.ids]
-        uid = 0
-        for first_id, nested_ids in enumerate(self.ids):
-            for second_id in nested_ids:
-                id_map[first_id][second_id] = uid
-                uid += 1
-        return id_map
+        return self._lookups[1]
 
     def partial_get(self, first_id: int) -> List[str]:
         """
@@ -262,7 +297,7 @@ class IdManager:
         int
             The number of ids.
         """
-        return sum(map(len, self.ids))
+        return len(self.id_list)
 
     @property
     def num_envs(self) -> int:
@@ -2,9 +2,21 @@
 """
 Helpers for working with entry_point plugins for Schola
 """
+from functools import lru_cache
 from typing import List
 
 
+@lru_cache(maxsize=None)
+def _entry_points():
+    """
+    Scan the installed distributions for entry points once, and share the result across plugin groups.
+    """
+    from importlib.metadata import entry_points
+
+    return entry_points()
+
+
+@lru_cache(maxsize=None)
 def get_plugins(group_name: str) -> List:
     """
     Returns a list of plugins for a given group name.
@@ -17,11 +29,9 @@ def get_plugins(group_name: str) -> List:
     Returns
     -------
     List
-        A list of loaded plugin objects for the specified group name.
+        A list of loaded plugin objects for the specified group name. Results are cached per group, so the list should not be modified.
     """
-    from importlib.metadata import entry_points
-
-    eps = entry_points()
+    eps = _entry_points()
     if hasattr(eps, "select"):
         discovered_plugins = eps.select(group=group_name)
     else:
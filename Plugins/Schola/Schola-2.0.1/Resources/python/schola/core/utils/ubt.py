@@ -4,12 +4,44 @@
 Utility Functions and classes for working with Unreal Engine's UBT (Unreal Build Tool) system.
 """
 
+import logging
 import os
+from collections import deque
 from pathlib import Path
 import platform
 import subprocess
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Union
+from typing import ClassVar, Dict, List, Literal, Optional, Tuple, Union
+
+# platform.system() does not change while the interpreter is running, so look it up once
+_SYSTEM = platform.system()
+# platform specific names, resolved once at import
+_IS_WIN = _SYSTEM == "Windows"
+_EDITOR_EXE = "UnrealEditor-Cmd.exe" if _IS_WIN else "UnrealEditor-Cmd"
+_BIN_DIR = "Win64" if _IS_WIN else "Linux"
+_UAT_EXT = "bat" if _IS_WIN else "sh"
+_EXE_SUFFIX = ".exe" if _IS_WIN else ""
+
+logger = logging.getLogger(__name__)
+
+# prefixes of the UAT arguments that carry a value
+_P_PLATFORM = "-platform="
+_P_PROJECT = "-project="
+_P_CONFIGURATION = "-configuration="
+_P_STAGING_DIR = "-stagingdirectory="
+_P_MAP = "-map="
+
+# number of trailing build output lines kept on the result of build_executable
+_BUILD_OUTPUT_TAIL_LINES = 500
+
+# parsed engine versions, keyed on (path, modification time) so edited project files are re-read
+_UE_VERSION_CACHE: Dict[Tuple[str, int], Optional[str]] = {}
+
+# first file found per (folder, suffix), stored with the folder's modification time so adding or removing files invalidates it
+_DIR_CACHE: Dict[Tuple[str, str], Tuple[int, Optional[Path]]] = {}
+
+# engine paths parsed from solution files, keyed on (path, modification time) so regenerated solutions are re-read
+_SLN_ENGINE_CACHE: Dict[Tuple[str, int], Optional[Path]] = {}
 
 
 def get_unreal_platform() -> Literal["Win64", "Linux"]:
@@ -21,15 +53,15 @@ def get_unreal_platform() -> Literal["Win64", "Linux"]:
     str
         The platform string for Unreal Engine (e.g., "Win64", "Linux", "Mac").
     """
-    if platform.system() == "Windows":
+    if _IS_WIN:
         return "Win64"
-    elif platform.system() == "Linux":
+    elif _SYSTEM == "Linux":
         return "Linux"
     else:
-        raise ValueError("Unsupported platform: {}".format(platform.system()))
+        raise ValueError("Unsupported platform: {}".format(_SYSTEM))
 
 
-@dataclass
+@dataclass(slots=True)
 class UBTCommand:
     """
     Dataclass for constructing Unreal Build Tool (UBT) command line arguments.
@@ -61,6 +93,29 @@ class UBTCommand:
     )  # List of maps to cook/package
     stdout: bool = True  # Whether to route build process output to stdout
 
+    # (fields that must all be set, argument, whether the last field's value is appended to the argument)
+    # in the order the arguments are passed to UAT
+    _ARGS: ClassVar[Tuple[Tuple[Tuple[str, ...], str, bool], ...]] = (
+        (("target_platform",), _P_PLATFORM, True),
+        (("project_file",), _P_PROJECT, True),
+        (("should_package",), "-package", False),
+        (("should_clean",), "-clean", False),
+        (("should_cook",), "-cook", False),
+        (("should_cook", "fast_cook"), "-FastCook", False),
+        (("should_build",), "-build", False),
+        (("no_p4",), "-NoP4", False),
+        (("prereqs",), "-prereqs", False),
+        (("no_compile",), "-nocompile", False),
+        (("no_compile_uat",), "-nocompileuat", False),
+        (("configuration",), _P_CONFIGURATION, True),
+        (("stdout",), "-stdout", False),
+        (("no_debug_info",), "-nodebuginfo", False),
+        (("unattended",), "-unattended", False),
+        (("staging_dir",), "-stage", False),
+        (("staging_dir",), _P_STAGING_DIR, True),
+        (("force_monolithic",), "-ForceMonolithic", False),
+    )
+
     @property
     def all_maps(self) -> bool:
         return len(self.maps) == 0
@@ -75,62 +130,14 @@ class UBTCommand:
             The complete list of UBT command line arguments.
         """
         args = [self.ubt_path, "BuildCookRun"]
-
-        if self.target_platform:
-            args.append(f"-platform={self.target_platform}")
-
-        if self.project_file:
-            args.append(f"-project={self.project_file}")
-
-        if self.should_package:
-            args.append("-package")
-
-        if self.should_clean:
-            args.append("-clean")
-
-        if self.should_cook:
-            args.append("-cook")
-            if self.fast_cook:
-                args.append("-FastCook")
-
-        if self.should_build:
-            args.append("-build")
-
-        if self.no_p4:
-            args.append("-NoP4")
-
-        if self.prereqs:
-            args.append("-prereqs")
-
-        if self.no_compile:
-            args.append("-nocompile")
-
-        if self.no_compile_uat:
-            args.append("-nocompileuat")
-
-        if self.configuration:
-            args.append(f"-configuration={self.configuration}")
-
-        if self.stdout:
-            args.append("-stdout")
-
-        if self.no_debug_info:
-            args.append("-nodebuginfo")
-
-        if self.unattended:
-            args.append("-unattended")
-
-        if self.staging_dir:
-            args.append("-stage")
-            args.append(f"-stagingdirectory={self.staging_dir}")
-
-        if self.force_monolithic:
-            args.append("-ForceMonolithic")
+        for attrs, arg, with_value in self._ARGS:
+            if all(getattr(self, attr) for attr in attrs):
+                args.append(arg + str(getattr(self, attrs[-1])) if with_value else arg)
 
         if self.all_maps:
             args.append("-AllMaps")
         elif self.maps:
-            args.append(f"-map={'+'.join(self.maps)}")
+            args.append(_P_MAP + "+".join(self.maps))
 
         return args
 
@@ -149,6 +156,9 @@ def get_ue_version(project_file: Path) -> str:
     str
         The Unreal Engine version string (e.g., "5.5").
     """
+    cache_key = (str(project_file), os.stat(project_file).st_mtime_ns)
+    if cache_key in _UE_VERSION_CACHE:
+        return _UE_VERSION_CACHE[cache_key]
     with open(project_file, "r") as f:
         # read the file as JSON
         import json
@@ -156,6 +166,7 @@ def get_ue_version(project_file: Path) -> str:
         project_data = json.load(f)
     # extract the engine version
     ue_version = project_data.get("EngineAssociation", None)
+    _UE_VERSION_CACHE[cache_key] = ue_version
     return ue_version
 
 
@@ -173,10 +184,23 @@ def get_project_file(project_folder: Path) -> Path:
     Path or None
         Path to the .uproject file if found, None otherwise.
     """
-    for file in os.listdir(project_folder):
-        if file.endswith(".uproject"):
-            return Path(os.path.join(project_folder, file))
-    return None
+    return _find_file_with_suffix(project_folder, ".uproject")
+
+
+def _find_file_with_suffix(folder: Path, suffix: str) -> Optional[Path]:
+    cache_key = (str(folder), suffix)
+    mtime = os.stat(folder).st_mtime_ns
+    cached = _DIR_CACHE.get(cache_key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    found = None
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix):
+                found = Path(entry.path)
+                break
+    _DIR_CACHE[cache_key] = (mtime, found)
+    return found
 
 
 def get_engine_path_from_sln(sln_file: Path) -> Path:
@@ -193,13 +217,21 @@ def get_engine_path_from_sln(sln_file: Path) -> Path:
     Path
         Path to the Unreal Engine installation directory.
     """
-    with open(sln_file, "r") as f:
+    cache_key = (str(sln_file), os.stat(sln_file).st_mtime_ns)
+    if cache_key in _SLN_ENGINE_CACHE:
+        return _SLN_ENGINE_CACHE[cache_key]
+    engine_path = None
+    # scan raw bytes with a larger read buffer, only the matching line is decoded
+    with open(sln_file, "rb", buffering=1 << 16) as f:
         for line in f:
-            if '"UnrealBuildTool"' in line:
+            if b'"UnrealBuildTool"' in line:
                 # extract the path to the UnrealBuildTool
-                parts = line.split(",")
+                parts = line.decode("utf-8", errors="replace").split(",")
                 # Get the path to the engine folder using the UBT entry in the solution file
-                return sln_file.parent / Path(parts[1].split("Engine")[0].strip(' "'))
+                engine_path = Path(sln_file).parent / Path(parts[1].split("Engine")[0].strip(' "'))
+                break
+    _SLN_ENGINE_CACHE[cache_key] = engine_path
+    return engine_path
 
 
 def get_sln_file_from_project(project_folder: Path) -> Optional[Path]:
@@ -216,10 +248,7 @@ def get_sln_file_from_project(project_folder: Path) -> Optional[Path]:
     Optional[Path]
         Path to the .sln file if found, None otherwise.
     """
-    for file in os.listdir(project_folder):
-        if file.endswith(".sln"):
-            return project_folder / file
-    return None
+    return _find_file_with_suffix(project_folder, ".sln")
 
 
 def get_ubt_path(project_folder: Path, ue_version: str = "5.5") -> Path:
@@ -238,7 +267,7 @@ def get_ubt_path(project_folder: Path, ue_version: str = "5.5") -> Path:
     Path
         Path to the RunUAT batch/shell script.
     """
-    # try and load it from a sln file
+    # the .sln discovery and parsing are cached per modification time, so the lookup always reflects the files on disk
     sln_file = get_sln_file_from_project(project_folder)
     if sln_file is not None:
         engine_path = get_engine_path_from_sln(sln_file)
@@ -248,11 +277,11 @@ def get_ubt_path(project_folder: Path, ue_version: str = "5.5") -> Path:
                 / "Engine"
                 / "Build"
                 / "BatchFiles"
-                / f"RunUAT.{('bat' if platform.system() == 'Windows' else 'sh')}"
+                / f"RunUAT.{_UAT_EXT}"
             )
     else:
         # if we can't find it in the sln file, try and use a default path
-        if platform.system() == "Windows":
+        if _IS_WIN:
             return Path(
                 "C:/Program Files/Epic Games/UE_"
                 + ue_version
@@ -276,13 +305,7 @@ def get_editor_executable_path(engine_path: Path) -> Path:
     Path
         Path to the UnrealEditor-Cmd executable.
     """
-    editor_tool = (
-        "UnrealEditor-Cmd.exe"
-        if platform.system() == "Windows"
-        else "UnrealEditor-Cmd"
-    )
-    bin_dir = "Win64" if platform.system() == "Windows" else "Linux"
-    return engine_path / "Engine" / "Binaries" / bin_dir / editor_tool
+    return engine_path / "Engine" / "Binaries" / _BIN_DIR / _EDITOR_EXE
 
 
 def build_executable(project_file: Path | str, build_dir: Path | str, ubt_path: Path | str, **kwargs):
@@ -303,13 +326,21 @@ def build_executable(project_file: Path | str, build_dir: Path | str, ubt_path:
     Returns
     -------
     subprocess.CompletedProcess
-        The result of the build process.
+        The result of the build process. stderr is merged into stdout, which holds the last lines of output as bytes.
+
+    Notes
+    -----
+    The build output is streamed line by line to this module's logger rather than buffered in memory, so only the tail of a full cook and build log is kept on the result.
     """
     args = UBTCommand(
         ubt_path=ubt_path, project_file=project_file, staging_dir=build_dir, **kwargs
     ).build_args()
-    comp_process = subprocess.run(args,capture_output=True)
-    return comp_process
+    tail = deque(maxlen=_BUILD_OUTPUT_TAIL_LINES)
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        for line in proc.stdout:
+            logger.info(line.decode("utf-8", errors="replace").rstrip())
+            tail.append(line)
+    return subprocess.CompletedProcess(args, proc.returncode, stdout=b"".join(tail))
 
 
 def quick_build_unreal_project(
@@ -366,12 +397,10 @@ def quick_build_unreal_project(
         ubt_path=str(ubt_path),
     )
 
-    executable_filename = Path(uproject_file).name.split(".")[0] + (
-        ".exe" if platform.system() == "Windows" else ""
-    )
+    executable_filename = Path(uproject_file).name.split(".")[0] + _EXE_SUFFIX
     built_path = (
         Path(build_dir)
-        / platform.system()
+        / _SYSTEM
         / "ScholaExamples"
         / "Binaries"
         / get_unreal_platform()
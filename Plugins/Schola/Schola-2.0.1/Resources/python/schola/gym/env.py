@@ -5,10 +5,10 @@ Implementation of gym.vector.VectorEnv backed by a Schola Environment.
 """
 
 from collections import defaultdict
+from copy import deepcopy
 from math import inf
 from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
 
-from ray import init
 from schola.core.protocols.base import BaseRLProtocol
 from schola.core.simulators.base import BaseSimulator, UnsupportedProtocolException
 from schola.core.protocols.base import AutoResetType
@@ -39,7 +39,7 @@ class GymEnv(gym.Env):
 
         self.protocol = protocol
         self.simulator = simulator
-        if (not isinstance(self.protocol, self.simulator.supported_protocols)):
+        if not self.simulator.supports_protocol(self.protocol):
             raise UnsupportedProtocolException(f"Protocol {self.protocol} is not supported by the simulator {self.simulator}.")
         
         self.protocol.start()
@@ -129,6 +129,10 @@ class GymVectorEnv(VectorEnv):
         The connection to the Unreal Engine.
     verbosity : int, default=0
         The verbosity level for the environment.
+    autoreset_mode : str | AutoresetMode, default=AutoresetMode.SAME_STEP
+        The autoreset mode used by the environment.
+    copy : bool, default=True
+        If True, reset and step return a copy of the batched observations. Otherwise they return the environment's observation buffer, which is overwritten by the next call to reset or step.
 
     Attributes
     ----------
@@ -136,11 +140,12 @@ class GymVectorEnv(VectorEnv):
         The information returned from the last reset.
     """
 
-    def __init__(self, simulator: BaseSimulator, protocol : BaseRLProtocol, verbosity: int = 0, autoreset_mode: str | AutoresetMode = AutoresetMode.SAME_STEP):
+    def __init__(self, simulator: BaseSimulator, protocol : BaseRLProtocol, verbosity: int = 0, autoreset_mode: str | AutoresetMode = AutoresetMode.SAME_STEP, copy: bool = True):
         
         self.protocol = protocol
+        self.copy = copy
         self.simulator = simulator
-        if (not isinstance(self.protocol, self.simulator.supported_protocols)):
+        if not self.simulator.supports_protocol(self.protocol):
             raise UnsupportedProtocolException(f"Protocol {self.protocol} is not supported by the simulator {self.simulator}.")
         
         self.protocol.start()
@@ -202,6 +207,23 @@ class GymVectorEnv(VectorEnv):
             self.protocol.close()
             self.simulator.stop()
             raise e
+
+        # the agents are fixed once defined, so resolve each agent's flattened id once rather than every step
+        # every agent shares the single action space, the map only ever gains one entry per agent id
+        self._action_space_map: Dict[str, gym.Space] = defaultdict(lambda: self.single_action_space)
+        # (env_id, agent_id) pairs in flattened order, used to flatten the nested per-step results
+        self._flat_keys: List[Tuple[int, str]] = list(self.id_manager.id_list)
+        self._agents_by_env: List[List[Tuple[str, int]]] = [
+            [(agent_id, self.id_manager[env_id, agent_id]) for agent_id in agent_id_list]
+            for env_id, agent_id_list in enumerate(self.id_manager.ids)
+        ]
+        # per-step buffers, filled in place and copied on return like gymnasium's SyncVectorEnv
+        self._rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self._terminations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._observations = gym.vector.utils.create_empty_array(
+            self.single_observation_space, n=self.num_envs
+        )
         
             
     def close(self, **kwargs):
@@ -221,7 +243,7 @@ class GymVectorEnv(VectorEnv):
         -----
         This method is not implemented and will always return a list of None values, as sub-environments are not individually accessible.
         """
-        return [None for x in range(0, self.num_envs)]
+        return [None] * self.num_envs
 
     def reset(
         self,
@@ -245,11 +267,13 @@ class GymVectorEnv(VectorEnv):
         
         processed_options = None
         if options is not None:
-            processed_options = [{} for _ in range(self.num_envs)]
             if "reset_mask" in options:
                 raise NotImplementedError("reset_mask option is not currently supported in Schola Vector Environments.")
-            for key, value in options.items():
-                processed_options[env_id][f"{agent_id}_{key}"] = value
+            # every option is applied to each agent, keyed by "<agent_id>_<option>" within its environment
+            processed_options = [
+                {f"{agent_id}_{key}": value for agent_id, _ in agents for key, value in options.items()}
+                for agents in self._agents_by_env
+            ]
 
         obs, nested_infos = self.protocol.send_reset_msg(seeds=seed, options=processed_options)
 
@@ -260,15 +284,12 @@ class GymVectorEnv(VectorEnv):
                 infos = self._add_info(infos, nested_infos[env_id][agent_id], uid)
 
         # flatten the observations, converting from dict to list using key as indices
-        batched_observations = gym.vector.utils.create_empty_array(
-            self.single_observation_space, n=self.num_envs
-        )
-        flattened_observations = self.id_manager.flatten_list_of_dicts(obs)
-        gym.vector.utils.concatenate(
-            self.single_observation_space, flattened_observations, batched_observations
+        flattened_observations = [obs[env_id][agent_id] for env_id, agent_id in self._flat_keys]
+        self._observations = gym.vector.utils.concatenate(
+            self.single_observation_space, flattened_observations, self._observations
         )
 
-        return batched_observations, infos
+        return deepcopy(self._observations) if self.copy else self._observations, infos
 
 
 
@@ -303,58 +324,55 @@ class GymVectorEnv(VectorEnv):
         Dict[int, Dict[str, str]],
     ]:
         actions = self.unbatch_actions(actions)
-        observations, rewards, terminateds, truncateds, nested_infos, initial_obs, initial_infos = self.protocol.send_action_msg(actions, defaultdict(lambda : self.single_action_space))
-
-        array_rewards = np.asarray(self.id_manager.flatten_list_of_dicts(rewards))
-        array_terminateds = np.asarray(self.id_manager.flatten_list_of_dicts(terminateds))
-        array_truncateds = np.asarray(self.id_manager.flatten_list_of_dicts(truncateds))
+        observations, rewards, terminateds, truncateds, nested_infos, initial_obs, initial_infos = self.protocol.send_action_msg(actions, self._action_space_map)
 
-        
         infos = {}
 
-        for env_id, agent_id_list in enumerate(self.id_manager.ids):
-            any_done = False
-            all_done = True
-            for agent_id in agent_id_list:
-                uid = self.id_manager[env_id, agent_id]
-                is_done = (terminateds[env_id][agent_id] or truncateds[env_id][agent_id])
-                any_done = any_done or is_done
-                all_done = all_done and is_done
+        # a single pass per env fills the step buffers, checks the done states and attaches the infos
+        for env_id, agents in enumerate(self._agents_by_env):
+            env_rewards = rewards[env_id]
+            env_terminateds = terminateds[env_id]
+            env_truncateds = truncateds[env_id]
+            num_done = 0
+            for agent_id, uid in agents:
+                self._rewards[uid] = env_rewards[agent_id]
+                self._terminations[uid] = env_terminateds[agent_id]
+                self._truncations[uid] = env_truncateds[agent_id]
+                if env_terminateds[agent_id] or env_truncateds[agent_id]:
+                    num_done += 1
 
             # We don't handle the case where 1 agent ends early currently.
-            if any_done and not all_done:
+            if 0 < num_done < len(agents):
                 raise EnvironmentException(
                     f"SB3 with multi-agent environments does not support agents completing at different steps. Env {env_id} had agents in different completion states."
                 )
-        
-        # if we get these then it means we are in self reset mode
 
-        for env_id, agent_id_list in enumerate(self.id_manager.ids):
-            for agent_id in agent_id_list:
-                uid = self.id_manager[env_id, agent_id]
-                if env_id in initial_obs:
-                    infos = self._add_info(infos,{"final_info":nested_infos[env_id][agent_id],
-                                                  "final_obs":observations[env_id][agent_id], 
-                                                  **initial_infos[env_id][agent_id]}, uid)
-                    observations[env_id][agent_id] = initial_obs[env_id][agent_id]
-                else:
-                    infos = self._add_info(infos,nested_infos[env_id][agent_id], uid)
+            env_infos = nested_infos[env_id]
+            # if we get these then it means we are in self reset mode
+            if env_id in initial_obs:
+                env_obs = observations[env_id]
+                env_initial_obs = initial_obs[env_id]
+                env_initial_infos = initial_infos[env_id]
+                for agent_id, uid in agents:
+                    infos = self._add_info(infos,{"final_info":env_infos[agent_id],
+                                                  "final_obs":env_obs[agent_id], 
+                                                  **env_initial_infos[agent_id]}, uid)
+                    env_obs[agent_id] = env_initial_obs[agent_id]
+            else:
+                for agent_id, uid in agents:
+                    infos = self._add_info(infos,env_infos[agent_id], uid)
 
         # flatten the observations, converting to one bit numpy ndarray
-
-        array_observations = gym.vector.utils.create_empty_array(
-            self.single_observation_space, n=self.num_envs
-        )
-        flattened_observations = self.id_manager.flatten_list_of_dicts(observations)
-        gym.vector.utils.concatenate(
-            self.single_observation_space, flattened_observations, array_observations
+        flattened_observations = [observations[env_id][agent_id] for env_id, agent_id in self._flat_keys]
+        self._observations = gym.vector.utils.concatenate(
+            self.single_observation_space, flattened_observations, self._observations
         )
 
         return (
-            array_observations,
-            array_rewards,
-            array_terminateds,
-            array_truncateds,
+            deepcopy(self._observations) if self.copy else self._observations,
+            np.copy(self._rewards),
+            np.copy(self._terminations),
+            np.copy(self._truncations),
             infos,
         )
 
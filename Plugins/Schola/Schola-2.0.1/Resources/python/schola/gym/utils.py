@@ -19,7 +19,7 @@ class PopActionWrapper(Wrapper):
             env.action_space, Dict
         ), "Action space must be a Dictionary Space."
         # Pop the first action from the action space
-        self.key, self.action_space = list(env.action_space.spaces.items())[0]
+        self.key, self.action_space = next(iter(env.action_space.spaces.items()))
 
     def step(self, action):
         """
@@ -97,7 +97,7 @@ class BaseRayEnv(ABC):
         # 1. Protocol and simulator setup
         self.protocol = protocol
         self.simulator = simulator
-        if not isinstance(self.protocol, self.simulator.supported_protocols):
+        if not self.simulator.supports_protocol(self.protocol):
             raise UnsupportedProtocolException(
                 f"Protocol {self.protocol} is not supported by the simulator {self.simulator}."
             )
@@ -625,13 +625,12 @@ class RayVecEnv(BaseRayEnv, VectorMultiAgentEnv):
         observations, infos = self.protocol.send_reset_msg(seeds=seed, options=options)
         
         # Update agent tracking and wrapper states based on what Unreal returned
-        for env_id in range(self.num_envs):
-            wrapper : _SingleEnvWrapper = self.envs[env_id]
+        for env_id, wrapper in enumerate(self.envs):
             wrapper._reset(observations[env_id])
-            logger.debug(f"Env {env_id} reset with agents: {wrapper._current_agents}")
+            logger.debug("Env %s reset with agents: %s", env_id, wrapper._current_agents)
         
         # Always return list format for vectorized environments
-        logger.debug(f"RayVecEnv.reset() returning list format: length={len(observations)}, num_envs={self.num_envs}")
+        logger.debug("RayVecEnv.reset() returning list format: length=%s, num_envs=%s", len(observations), self.num_envs)
         return observations, infos
 
     def step(self, actions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, float]], List[Dict[str, bool]], List[Dict[str, bool]], List[Dict[str, Any]]]:
@@ -645,7 +644,7 @@ class RayVecEnv(BaseRayEnv, VectorMultiAgentEnv):
             Tuple of (observations, rewards, terminateds, truncateds, infos) as List[MultiAgentDict] format.
         """
         # Convert actions list to dict format expected by protocol
-        action_dict = {i: actions[i] for i in range(len(actions))}
+        action_dict = dict(enumerate(actions))
         
         # We are in Next Step reset mode so ignore the initial_obs and initial_infos
         observations, rewards, terminateds, truncateds, infos, _, _ = self.protocol.send_action_msg(action_dict, self._single_action_spaces)
@@ -654,21 +653,22 @@ class RayVecEnv(BaseRayEnv, VectorMultiAgentEnv):
         # Following RLlib spec: terminateds/truncateds dicts contain ALL agents (even inactive ones)
         # In turn-based/hierarchical scenarios, agents may not act every step but are still alive
         # and appear in terminateds/truncateds with False values
-        for env_id in range(self.num_envs):
-            env : _SingleEnvWrapper = self.envs[env_id]
-            env._step(observations[env_id], terminateds[env_id], truncateds[env_id])
-        
-            agents_in_this_env = env._current_agents | env._terminated_agents | env._truncated_agents
-            num_done = len(env._terminated_agents | env._truncated_agents)
-            num_total = len(agents_in_this_env)
+        for env_id, env in enumerate(self.envs):
+            env_terminateds = terminateds[env_id]
+            env_truncateds = truncateds[env_id]
+            env._step(observations[env_id], env_terminateds, env_truncateds)
+        
+            done_agents = env._terminated_agents | env._truncated_agents
+            num_done = len(done_agents)
+            num_total = len(env._current_agents | done_agents)
             
-            terminateds[env_id]["__all__"] = (num_done == num_total) if num_total > 0 else False
-            truncateds[env_id]["__all__"] = (len(env._truncated_agents) == num_total) if num_total > 0 else False
-            if terminateds[env_id]["__all__"] or truncateds[env_id]["__all__"]:
+            env_terminateds["__all__"] = (num_done == num_total) if num_total > 0 else False
+            env_truncateds["__all__"] = (len(env._truncated_agents) == num_total) if num_total > 0 else False
+            if env_terminateds["__all__"] or env_truncateds["__all__"]:
                 env._reset_on_next_step = True
 
         
         # Always return list format for vectorized environments
-        logger.debug(f"RayVecEnv.step() returning list format: num_envs={self.num_envs}")
+        logger.debug("RayVecEnv.step() returning list format: num_envs=%s", self.num_envs)
         return observations, rewards, terminateds, truncateds, infos
 
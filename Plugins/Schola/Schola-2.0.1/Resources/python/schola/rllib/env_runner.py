@@ -5,25 +5,32 @@ RLlib Environment Runner for Schola/Unreal Engine. Use this class to use the Ray
 
 import logging
 from functools import partial
-import gymnasium as gym
-from ray.rllib.callbacks.utils import make_callback
-from ray.rllib.env.env_context import EnvContext
 from ray.rllib.env.env_runner import EnvRunner
 from ray.rllib.utils.annotations import override
 from ray.rllib.env.multi_agent_env_runner import MultiAgentEnvRunner
-from ray.tune.registry import ENV_CREATOR, _global_registry
 
 from schola.core.protocols.base import BaseRLProtocol
 from schola.core.simulators.base import BaseSimulator
-from schola.rllib.env import RayVecEnv
 
 logger = logging.getLogger("ray.rllib")
 
 
+def _validate_env_ctx(env_ctx) -> None:
+    assert "protocol" in env_ctx, "Protocol must be provided in the env_config"
+    assert "simulator" in env_ctx, "Simulator must be provided in the env_config"
+    assert issubclass(env_ctx["protocol"], BaseRLProtocol), "Protocol must be a BaseRLProtocol"
+    assert issubclass(env_ctx["simulator"], BaseSimulator), "Simulator must be a BaseSimulator"
+
+
 class ScholaEnvRunner(MultiAgentEnvRunner):
 
     @override(EnvRunner)
     def make_env(self):
+        # only needed once an environment is created, so keep them off the module import path
+        from ray.rllib.callbacks.utils import make_callback
+        from ray.rllib.env.env_context import EnvContext
+        from schola.rllib.env import RayVecEnv
+
         # If an env already exists, try closing it first (to allow it to properly
         # cleanup).
         if self.env is not None:
@@ -45,13 +52,19 @@ class ScholaEnvRunner(MultiAgentEnvRunner):
                 remote=self.config.remote_worker_envs,
             )
 
-        assert "protocol" in env_ctx, "Protocol must be provided in the env_config"
-        assert "simulator" in env_ctx, "Simulator must be provided in the env_config"
-        assert issubclass(env_ctx["protocol"], BaseRLProtocol), "Protocol must be a BaseRLProtocol"
-        assert issubclass(env_ctx["simulator"], BaseSimulator), "Simulator must be a BaseSimulator"
-        
+        # the env config does not change between recreations, so validate it and bind the constructor arguments once
+        env_factories = getattr(self, "_env_factories", None)
+        if env_factories is None:
+            _validate_env_ctx(env_ctx)
+            env_factories = (
+                partial(env_ctx["protocol"], **env_ctx["protocol_args"]),
+                partial(env_ctx["simulator"], **env_ctx["simulator_args"]),
+            )
+            self._env_factories = env_factories
+        protocol_factory, simulator_factory = env_factories
+
         # Create the environment
-        self.env = RayVecEnv(env_ctx["protocol"](**env_ctx["protocol_args"]), env_ctx["simulator"](**env_ctx["simulator_args"]))
+        self.env = RayVecEnv(protocol_factory(), simulator_factory())
         
         self.num_envs: int = self.env.num_envs
         if self.num_envs != self.config.num_envs_per_env_runner:
@@ -64,15 +77,16 @@ class ScholaEnvRunner(MultiAgentEnvRunner):
         # Set the flag to reset all envs upon the next `sample()` call.
         self._needs_initial_reset = True
 
-        # Call the `on_environment_created` callback.
-        make_callback(
-            "on_environment_created",
-            callbacks_objects=self._callbacks,
-            callbacks_functions=self.config.callbacks_on_environment_created,
-            kwargs=dict(
-                env_runner=self,
-                metrics_logger=self.metrics,
-                env=self.env.unwrapped,
-                env_context=env_ctx,
-            ),
-        )
\ No newline at end of file
+        # Call the `on_environment_created` callback, skipping the call entirely when nothing is registered.
+        if self._callbacks or self.config.callbacks_on_environment_created:
+            make_callback(
+                "on_environment_created",
+                callbacks_objects=self._callbacks,
+                callbacks_functions=self.config.callbacks_on_environment_created,
+                kwargs=dict(
+                    env_runner=self,
+                    metrics_logger=self.metrics,
+                    env=self.env.unwrapped,
+                    env_context=env_ctx,
+                ),
+            )
@@ -1,52 +1,183 @@
 # Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
 
-import json
-from ray.rllib.evaluation.sample_batch_builder import SampleBatchBuilder
+import sys
+from operator import itemgetter, methodcaller
+from typing import Iterable, List, Tuple
+import numpy as np
 from ray.rllib.offline.json_writer import JsonWriter
+from ray.rllib.policy.sample_batch import SampleBatch
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # orjson is optional and only speeds up decoding, fall back to the standard library
+    from json import loads as _json_loads
 
-def read_expert_from_json(expert_path: str):
-    # read the expert transitions from json
-    obs = []
-    acts = []
-    combined = []
-    data_path = expert_path
-    with open(data_path, "r") as f:
-        data = json.load(f)
-        data = data["steps"]
-        for step in data:
-            step_number = step["stepNum"]
-            step_obs = step["observations"]
-            step_act = step["actions"]
-            step_rews = step["rewards"] if "rewards" in step else None
-            obs_concat = []
-            for sensor_data in step_obs:
-                sensor_name = sensor_data["interactorName"]
-                sensor_value = [float(data) for data in sensor_data["value"].split(",")]
-                obs_concat.extend(sensor_value)
-            obs.append(obs_concat)
-            step_act_concat = []
-            for actuator_data in step_act:
-                actuator_name = actuator_data["interactorName"]
-                actuator_value = [
-                    float(data) for data in actuator_data["value"].split(",")
-                ]
-                step_act_concat.extend(actuator_value)
-            acts.append(step_act_concat)
-            combined.append([obs_concat, step_act_concat])
-    return combined
-
-
-def convert_to_rllib_format(expert_path: str, output_path: str) -> str:
+
+_value_getter = itemgetter("value")
+_comma_counter = methodcaller("count", ",")
+
+
+def _count_values(values: List[str]) -> int:
+    # each interactor value is a comma separated string, so it holds one more number than it has commas
+    return sum(map(_comma_counter, values)) + len(values)
+
+
+def _parse_values(values: List[str], widths: List[int], name: str, dtype: np.dtype) -> np.ndarray:
+    # parse the values of every step in a single numpy call straight into one (steps, width) array,
+    # after checking every step has the same width so rows cannot silently shift into each other
+    if not widths:
+        return np.empty((0, 0), dtype=dtype)
+    width = widths[0]
+    for step, step_width in enumerate(widths):
+        if step_width != width:
+            raise ValueError(
+                f"Expert step {step} has {step_width} {name} values, but the first step has {width}."
+            )
+    parsed = np.fromstring(",".join(values), sep=",", dtype=dtype)
+    if parsed.size != len(widths) * width:
+        raise ValueError(f"Could not parse the {name} values of the expert data as numbers.")
+    return parsed.reshape(len(widths), width)
+
+
+def _stack_expert_steps(steps: Iterable[dict], dtype: np.dtype = np.float32) -> Tuple[np.ndarray, np.ndarray]:
+    obs_values = []
+    act_values = []
+    obs_widths = []
+    act_widths = []
+    for step in steps:
+        step_obs = list(map(_value_getter, step["observations"]))
+        step_acts = list(map(_value_getter, step["actions"]))
+        obs_values.extend(step_obs)
+        act_values.extend(step_acts)
+        obs_widths.append(_count_values(step_obs))
+        act_widths.append(_count_values(step_acts))
+    return (
+        _parse_values(obs_values, obs_widths, "observation", dtype),
+        _parse_values(act_values, act_widths, "action", dtype),
+    )
+
+
+def _read_expert_arrays_from_json(expert_path: str, dtype: np.dtype = np.float32) -> Tuple[np.ndarray, np.ndarray]:
+    # read the expert transitions from json, as (steps, obs_dim) and (steps, act_dim) arrays
+    with open(expert_path, "rb") as f:
+        data = _json_loads(f.read())
+    return _stack_expert_steps(data["steps"], dtype)
+
+
+def read_expert_from_json(expert_path: str) -> List[List[List[float]]]:
     """
-    Convert the expert data to RLlib format.
+    Read expert transitions from a JSON file, as a list of observation and action pairs.
+
+    Parameters
+    ----------
+    expert_path : str
+        Path to the expert data.
+
+    Returns
+    -------
+    List[List[List[float]]]
+        One ``[observations, actions]`` pair of lists per step.
+
+    See Also
+    --------
+    read_expert : Reads the same data as arrays, without building the per step lists.
+    """
+    # parse at float64 so the lists hold the same floats as parsing each value with float()
+    obs, acts = _read_expert_arrays_from_json(expert_path, np.float64)
+    return [list(pair) for pair in zip(obs.tolist(), acts.tolist())]
+
+
+def read_expert_from_jsonl(expert_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read expert transitions from a JSONL file, with one step per line.
+
+    Parameters
+    ----------
+    expert_path : str
+        Path to the expert data.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The observations and actions of every step as float32 arrays, with shapes (steps, obs_dim) and (steps, act_dim). Both are (0, 0) if there are no steps.
+
+    Raises
+    ------
+    ValueError
+        If the steps do not all have the same number of observation or action values.
+    """
+    # decode one line at a time rather than holding the whole document in memory
+    with open(expert_path, "rb") as f:
+        return _stack_expert_steps(_json_loads(line) for line in f if line.strip())
+
+
+def read_expert(expert_path: str, upcast_on_load: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read expert transitions, choosing the reader from the file extension.
+
+    Parameters
+    ----------
+    expert_path : str
+        Path to the expert data. ``.npz`` files written by :func:`convert_expert_to_npz` are loaded directly, ``.jsonl`` files are read one step per line, and anything else is read as a single JSON document.
+    upcast_on_load : bool, default=True
+        Whether to convert arrays stored at a lower precision in a ``.npz`` file back to float32.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The observations and actions of every step, with shapes (steps, obs_dim) and (steps, act_dim).
+    """
+    expert_path = str(expert_path)
+    if expert_path.endswith(".npz"):
+        with np.load(expert_path) as arrays:
+            obs, acts = arrays["obs"], arrays["acts"]
+        if upcast_on_load:
+            obs, acts = obs.astype(np.float32, copy=False), acts.astype(np.float32, copy=False)
+        return obs, acts
+    if expert_path.endswith(".jsonl"):
+        return read_expert_from_jsonl(expert_path)
+    return _read_expert_arrays_from_json(expert_path)
+
+
+def convert_expert_to_npz(expert_path: str, npz_path: str, dtype: np.dtype = np.float32) -> str:
+    """
+    Parse JSON or JSONL expert data once and save the observations and actions as binary arrays, so later loads skip the text parsing.
 
     Parameters
     ----------
     expert_path : str
         Path to the original expert data.
+    npz_path : str
+        Path to write the ``.npz`` file to.
+    dtype : np.dtype, default=np.float32
+        The dtype to store the arrays as. np.float16 halves the file size at the cost of precision.
+
+    Returns
+    -------
+    str
+        Path to the written file.
+    """
+    obs, acts = read_expert(expert_path, upcast_on_load=False)
+    np.savez(npz_path, obs=obs.astype(dtype, copy=False), acts=acts.astype(dtype, copy=False))
+    # np.savez appends .npz when the path does not already end with it
+    return npz_path if str(npz_path).endswith(".npz") else f"{npz_path}.npz"
+
+
+def convert_to_rllib_format(expert_path: str, output_path: str, chunk_size: int = 4096, dtype: np.dtype = np.float32) -> str:
+    """
+    Convert the expert data to RLlib format.
+
+    Parameters
+    ----------
+    expert_path : str
+        Path to the original expert data, in any format supported by :func:`read_expert`.
     output_path : str
         Path to the output converted data.
+    chunk_size : int, default=4096
+        Number of steps written per batch. Each batch is serialized and written before the next is built, bounding the memory used by the writer.
+    dtype : np.dtype, default=np.float32
+        The dtype to store the observations and actions as. np.float16 halves the size of the written batches, the learner should upcast them when loading.
 
     Returns
     -------
@@ -54,15 +185,22 @@ def convert_to_rllib_format(expert_path: str, output_path: str) -> str:
         Path to the converted data.
     """
 
-    data = read_expert_from_json(expert_path)
-    batch_builder = SampleBatchBuilder()
-    write_batch = JsonWriter(path=output_path)
-    for i in range(len(data)):
-        batch_builder.add_values(
-            t=i,
-            obs=data[i][0],
-            actions=data[i][1],
+    obs, actions = read_expert(expert_path, upcast_on_load=False)
+    obs, actions = obs.astype(dtype, copy=False), actions.astype(dtype, copy=False)
+    t = np.arange(len(obs), dtype=np.int64)
+    # keep every chunk in the same file, as the path of a single file is returned
+    write_batch = JsonWriter(path=output_path, max_file_size=sys.maxsize)
+    # write a single empty batch when there are no steps, so the output file is still created
+    for start in range(0, max(len(obs), 1), chunk_size):
+        end = start + chunk_size
+        # build each batch from whole columns rather than adding the steps one at a time
+        write_batch.write(
+            SampleBatch(
+                {
+                    SampleBatch.T: t[start:end],
+                    SampleBatch.OBS: obs[start:end],
+                    SampleBatch.ACTIONS: actions[start:end],
+                }
+            )
         )
-    batch = batch_builder.build_and_reset()
-    write_batch.write(batch)
     return write_batch.cur_file.name
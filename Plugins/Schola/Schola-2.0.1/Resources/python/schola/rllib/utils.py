@@ -14,7 +14,7 @@ import torch as th
 from ray.rllib.policy.sample_batch import SampleBatch
 import os
 import numpy as np
-from schola.core.model import ScholaModel
+from schola.core.model import ScholaModel, export_onnx
 import gymnasium as gym
 import gymnasium as gym
 from gymnasium import spaces
@@ -172,17 +172,14 @@ class ScholaRLModule(th.nn.Module):
         # Get the input dim from the model
         # input_dim = gym.spaces.utils.flatten_space(model.observation_space).shape
         # Export the model to ONNX
-        # Pass the path as a string (not a file object) for compatibility with newer PyTorch ONNX exporters
-        # Use dynamo=False for legacy exporter which properly handles input_names parameter
-        th.onnx.export(
+        export_onnx(
             self,
             tuple(inputs),
-            str(export_path),
+            export_path,
             opset_version=onnx_opset,
             input_names=input_names,
             output_names=output_names,
             dynamic_axes={k: {0: "batch_size"} for k in input_names},
-            dynamo=False,
         )
         print("Model exported to ONNX")
 
@@ -393,18 +390,15 @@ class RLLibScholaModel(ScholaModel):
         output_names.append("state_out")
         # Note that the seq_lens gets dropped from the exported model
         
-        # Pass the path as a string (not a file object) for compatibility with newer PyTorch ONNX exporters
-        # Use dynamo=False for legacy exporter which properly handles input_names parameter
-        th.onnx.export(
+        export_onnx(
             self,
             tuple(inputs),
-            str(export_path),
+            export_path,
             export_params=True,
             opset_version=onnx_opset,
             input_names=input_names,
             output_names=output_names,
             dynamic_axes={k: {0: "batch_size"} for k in input_names},
-            dynamo=False,
         )
 
 # end of adapted code
@@ -3,4 +3,9 @@
 Support for Stable Baselines 3 environments.
 """
 
+import os
 
+if os.environ.get("SCHOLA_PRECOMPILE") == "1":
+    from schola.sb3._precompile import pre_compile
+
+    pre_compile()
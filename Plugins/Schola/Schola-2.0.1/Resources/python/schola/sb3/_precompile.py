@@ -0,0 +1,30 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+
+"""
+Warm up the JIT compiled kernels used by the Stable Baselines 3 integration, so later runs load them from disk.
+"""
+
+import os
+
+INDUCTOR_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "schola", "inductor")
+
+
+def use_persistent_inductor_cache() -> None:
+    """
+    Point the torch.compile (inductor) cache at a per-user directory, unless one is already configured, so compiled kernels are reused across runs.
+    """
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", INDUCTOR_CACHE_DIR)
+
+
+def pre_compile() -> None:
+    """
+    Compile the Numba GAE kernel with the dtypes used by the rollout buffer, writing it to Numba's on-disk cache.
+    """
+    import numpy as np
+    from schola.sb3.buffers import compute_gae
+
+    use_persistent_inductor_cache()
+    # RolloutBuffer stores everything as float32, numba specializes on the argument types so match them exactly
+    steps = np.zeros((8, 1), dtype=np.float32)
+    envs = np.zeros(1, dtype=np.float32)
+    compute_gae(steps, steps, steps, envs, envs, 0.99, 0.95, np.zeros_like(steps))
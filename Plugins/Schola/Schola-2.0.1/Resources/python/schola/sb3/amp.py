@@ -0,0 +1,166 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+
+"""
+Mixed precision training for Stable Baselines 3 algorithms.
+"""
+
+from contextlib import ExitStack, contextmanager
+import functools
+from typing import Any, Callable, Iterator, List, Tuple
+import torch as th
+from stable_baselines3.common.base_class import BaseAlgorithm
+
+
+def _to_float32(output: Any) -> Any:
+    # SB3 computes its losses in float32 and calls .numpy() on policy outputs, which does not support bfloat16
+    if isinstance(output, th.Tensor):
+        return output.float() if output.is_floating_point() else output
+    if isinstance(output, tuple):
+        return tuple(map(_to_float32, output))
+    return output
+
+
+@contextmanager
+def _shadow(obj: Any, name: str, wrapper: Callable[[Callable], Callable]) -> Iterator[None]:
+    # shadow the method with a wrapped instance attribute, restoring whatever was there before on exit
+    instance_attrs = vars(obj)
+    had_attr = name in instance_attrs
+    previous = instance_attrs.get(name)
+    setattr(obj, name, wrapper(getattr(obj, name)))
+    try:
+        yield
+    finally:
+        if had_attr:
+            setattr(obj, name, previous)
+        else:
+            delattr(obj, name)
+
+
+def _autocast(device_type: str, dtype: th.dtype) -> Callable[[Callable], Callable]:
+    def wrapper(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def autocast_method(*args, **kwargs):
+            with th.autocast(device_type=device_type, dtype=dtype):
+                output = method(*args, **kwargs)
+            return _to_float32(output)
+
+        return autocast_method
+
+    return wrapper
+
+
+def _training_methods(model: BaseAlgorithm) -> List[Tuple[Any, str]]:
+    policy = model.policy
+    # on-policy algorithms (e.g. PPO) evaluate every network used by the loss in a single call
+    if hasattr(policy, "evaluate_actions"):
+        return [(policy, "evaluate_actions")]
+    # off-policy actor critic algorithms (e.g. SAC) call the actor and critics separately
+    return [
+        (policy.actor, "action_log_prob"),
+        (policy.critic, "forward"),
+        (policy.critic_target, "forward"),
+    ]
+
+
+def _optimizers(model: BaseAlgorithm) -> List[th.optim.Optimizer]:
+    optimizers = {}
+    for module in model.policy.modules():
+        optimizer = getattr(module, "optimizer", None)
+        if isinstance(optimizer, th.optim.Optimizer):
+            optimizers[id(optimizer)] = optimizer
+    ent_coef_optimizer = getattr(model, "ent_coef_optimizer", None)
+    if ent_coef_optimizer is not None:
+        optimizers[id(ent_coef_optimizer)] = ent_coef_optimizer
+    return list(optimizers.values())
+
+
+@contextmanager
+def _scaled_gradients(optimizers: List[th.optim.Optimizer], device_type: str) -> Iterator[None]:
+    # SB3 runs zero_grad, backward, (clip) and step itself, so the loss scaling is threaded through those calls
+    scaler = th.amp.GradScaler(device_type)
+    original_backward = th.Tensor.backward
+    state = {"optimizer": None, "stepping": False}
+
+    def zero_grad(optimizer: th.optim.Optimizer) -> Callable[[Callable], Callable]:
+        def wrapper(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def scaled_zero_grad(*args, **kwargs):
+                state["optimizer"] = optimizer
+                return method(*args, **kwargs)
+
+            return scaled_zero_grad
+
+        return wrapper
+
+    def step(optimizer: th.optim.Optimizer) -> Callable[[Callable], Callable]:
+        def wrapper(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def scaled_step(*args, **kwargs):
+                # GradScaler.step calls optimizer.step itself, which has to reach the real step
+                if state["stepping"]:
+                    return method(*args, **kwargs)
+                state["stepping"] = True
+                try:
+                    output = scaler.step(optimizer, *args, **kwargs)
+                finally:
+                    state["stepping"] = False
+                scaler.update()
+                return output
+
+            return scaled_step
+
+        return wrapper
+
+    def backward(tensor: th.Tensor, *args, **kwargs):
+        optimizer = state["optimizer"]
+        if optimizer is None:
+            return original_backward(tensor, *args, **kwargs)
+        state["optimizer"] = None
+        original_backward(scaler.scale(tensor), *args, **kwargs)
+        # unscale straight away, so gradient clipping between backward and step sees the true gradients
+        scaler.unscale_(optimizer)
+
+    with ExitStack() as stack:
+        for optimizer in optimizers:
+            stack.enter_context(_shadow(optimizer, "zero_grad", zero_grad(optimizer)))
+            stack.enter_context(_shadow(optimizer, "step", step(optimizer)))
+        th.Tensor.backward = backward
+        try:
+            yield
+        finally:
+            th.Tensor.backward = original_backward
+
+
+@contextmanager
+def autocast_training(model: BaseAlgorithm, dtype: th.dtype, include_rollouts: bool = False) -> Iterator[None]:
+    """
+    Run the networks used by the gradient updates of a Stable Baselines 3 algorithm under torch.autocast, while active.
+
+    Unless ``include_rollouts`` is set, only the calls made by ``train`` are autocast. The outputs of every autocast call are returned as float32, so the losses, the rollout buffers and the actions passed to the environment stay float32. With float16, the losses are scaled with a GradScaler so small gradients do not underflow.
+
+    Parameters
+    ----------
+    model : BaseAlgorithm
+        The algorithm to train, an on-policy algorithm such as PPO or an actor critic algorithm such as SAC.
+    dtype : th.dtype
+        The dtype to autocast to, th.bfloat16 or th.float16.
+    include_rollouts : bool, default=False
+        Whether to also autocast the policy calls made while collecting rollouts. Needed when the weights themselves are stored at a lower precision, e.g. after IPEX optimization.
+
+    Yields
+    ------
+    None
+        The networks are restored on exit.
+    """
+    device_type = model.device.type
+    methods = _training_methods(model)
+    if include_rollouts:
+        methods += [(model.policy, "forward"), (model.policy, "_predict")]
+        if hasattr(model.policy, "predict_values"):
+            methods.append((model.policy, "predict_values"))
+    with ExitStack() as stack:
+        for obj, name in methods:
+            stack.enter_context(_shadow(obj, name, _autocast(device_type, dtype)))
+        if dtype == th.float16:
+            stack.enter_context(_scaled_gradients(_optimizers(model), device_type))
+        yield
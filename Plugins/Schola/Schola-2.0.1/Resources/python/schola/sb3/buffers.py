@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+
+"""
+Rollout and replay buffers for Stable Baselines 3.
+"""
+
+import tempfile
+from typing import Optional
+import numpy as np
+import torch as th
+from stable_baselines3.common.buffers import ReplayBuffer, RolloutBuffer
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional, without it the kernel still works but runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def compute_gae(
+    rewards: np.ndarray,
+    values: np.ndarray,
+    episode_starts: np.ndarray,
+    last_values: np.ndarray,
+    dones: np.ndarray,
+    gamma: float,
+    gae_lambda: float,
+    advantages: np.ndarray,
+) -> None:
+    """
+    Compute Generalized Advantage Estimation (GAE) in place, matching RolloutBuffer.compute_returns_and_advantage.
+
+    Parameters
+    ----------
+    rewards : np.ndarray
+        The rewards of each step, with shape (n_steps, n_envs).
+    values : np.ndarray
+        The value estimates of each step, with shape (n_steps, n_envs).
+    episode_starts : np.ndarray
+        Whether each step started a new episode, with shape (n_steps, n_envs).
+    last_values : np.ndarray
+        The value estimates of the observations following the last step, with shape (n_envs,).
+    dones : np.ndarray
+        Whether the last step ended an episode, with shape (n_envs,).
+    gamma : float
+        The discount factor.
+    gae_lambda : float
+        The GAE bias-variance trade-off factor.
+    advantages : np.ndarray
+        The array to write the advantages to, with shape (n_steps, n_envs).
+    """
+    n_steps, n_envs = rewards.shape
+    for env in range(n_envs):
+        last_gae_lam = 0.0
+        next_non_terminal = 1.0 - dones[env]
+        next_values = last_values[env]
+        for step in range(n_steps - 1, -1, -1):
+            delta = rewards[step, env] + gamma * next_values * next_non_terminal - values[step, env]
+            last_gae_lam = delta + gamma * gae_lambda * next_non_terminal * last_gae_lam
+            advantages[step, env] = last_gae_lam
+            next_non_terminal = 1.0 - episode_starts[step, env]
+            next_values = values[step, env]
+
+
+class NumbaRolloutBuffer(RolloutBuffer):
+    """
+    A RolloutBuffer that computes the advantages with a Numba compiled kernel instead of a Python loop over the steps.
+    """
+
+    def compute_returns_and_advantage(self, last_values: th.Tensor, dones: np.ndarray) -> None:
+        last_values = last_values.clone().cpu().numpy().flatten()
+        compute_gae(
+            self.rewards,
+            self.values,
+            self.episode_starts,
+            last_values,
+            dones.astype(np.float32),
+            self.gamma,
+            self.gae_lambda,
+            self.advantages,
+        )
+        self.returns = self.advantages + self.values
+
+
+def _memmap_like(array: np.ndarray, directory: Optional[str] = None) -> np.memmap:
+    # the temporary file is unlinked as soon as it is closed, the mapping keeps the storage alive until it is released
+    with tempfile.TemporaryFile(dir=directory) as f:
+        return np.memmap(f, dtype=array.dtype, mode="w+", shape=array.shape)
+
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """
+    A ReplayBuffer that keeps the observations in memory mapped temporary files, so the buffer can grow beyond the available RAM.
+
+    Parameters
+    ----------
+    *args
+        Positional arguments for ReplayBuffer.
+    memmap_dir : str, optional
+        The directory to create the temporary files in. Defaults to the system temporary directory.
+    **kwargs
+        Keyword arguments for ReplayBuffer.
+    """
+
+    def __init__(self, *args, memmap_dir: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # the arrays allocated by ReplayBuffer are never written to, so their pages are not yet resident when they are replaced
+        self.observations = _memmap_like(self.observations, memmap_dir)
+        if not self.optimize_memory_usage:
+            self.next_observations = _memmap_like(self.next_observations, memmap_dir)
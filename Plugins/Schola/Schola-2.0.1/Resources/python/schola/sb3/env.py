@@ -55,7 +55,7 @@ class VecEnv(Sb3VecEnv):
         self.steps: int = 0
         self.next_action: Optional[Dict[int, Dict[str, Any]]] = None
 
-        if not isinstance(self.protocol, self.simulator.supported_protocols):
+        if not self.simulator.supports_protocol(self.protocol):
             raise UnsupportedProtocolException(
                 f"Protocol {self.protocol} is not supported by the simulator {self.simulator}."
             )
@@ -74,6 +74,13 @@ class VecEnv(Sb3VecEnv):
 
         super().__init__(self.id_manager.num_ids, obs_space, action_space)
 
+        # the agents are fixed once defined, so resolve each agent's flattened id once rather than every step
+        self._action_space_map: Dict[str, gym.Space] = defaultdict(lambda: self.action_space)
+        self._agents_by_env: List[List[Tuple[str, int]]] = [
+            [(agent_id, self.id_manager[env_id, agent_id]) for agent_id in agent_id_list]
+            for env_id, agent_id_list in enumerate(self.id_manager.ids)
+        ]
+
     def _define_environment(self):
         """
         Define and validate the environment structure from Unreal Engine.
@@ -246,13 +253,11 @@ class VecEnv(Sb3VecEnv):
             nested_infos,
             initial_obs,
             initial_infos,
-        ) = self.protocol.send_action_msg(
-            self.next_actions, defaultdict(lambda: self.action_space)
-        )
+        ) = self.protocol.send_action_msg(self.next_actions, self._action_space_map)
 
+        # fresh arrays each step, SB3 keeps a reference to the returned dones between steps
         array_dones = np.empty((self.id_manager.num_ids,), dtype=np.bool_)
-
-        array_rewards = np.asarray(self.id_manager.flatten_list_of_dicts(rewards))
+        array_rewards = np.empty((self.id_manager.num_ids,), dtype=np.float64)
 
         array_observations = self.id_manager.flatten_list_of_dicts(observations)
 
@@ -263,19 +268,20 @@ class VecEnv(Sb3VecEnv):
                 # safe because we are iterating over nested_infos
                 infos[uid] = single_env_info[agent_id]
 
-        for env_id, agent_id_list in enumerate(self.id_manager.ids):
-            any_done = False
-            all_done = True
-            for agent_id in agent_id_list:
-                uid = self.id_manager[env_id, agent_id]
-                array_dones[uid] = terminateds[env_id].get(
-                    agent_id, False
-                ) or truncateds[env_id].get(agent_id, False)
-                any_done = any_done or array_dones[uid]
-                all_done = all_done and array_dones[uid]
+        # a single pass per env fills the rewards and dones and checks the done states
+        for env_id, agents in enumerate(self._agents_by_env):
+            env_rewards = rewards[env_id]
+            env_terminateds = terminateds[env_id]
+            env_truncateds = truncateds[env_id]
+            num_done = 0
+            for agent_id, uid in agents:
+                array_rewards[uid] = env_rewards[agent_id]
+                done = env_terminateds.get(agent_id, False) or env_truncateds.get(agent_id, False)
+                array_dones[uid] = done
+                num_done += bool(done)
 
             # We don't handle the case where 1 agent ends early currently.
-            if any_done and not all_done:
+            if 0 < num_done < len(agents):
                 raise EnvironmentException(
                     f"SB3 with multi-agent environments does not support agents completing at different steps. Env {env_id} had agents in different completion states."
                 )
@@ -19,7 +19,7 @@ from stable_baselines3.common.vec_env.base_vec_env import (
     VecEnv,
     VecEnvWrapper,
 )
-from schola.core.model import ScholaModel
+from schola.core.model import ScholaModel, export_onnx
 from gymnasium.spaces import Box, Discrete, MultiDiscrete, MultiBinary
 import stable_baselines3 as sb3
 
@@ -131,17 +131,14 @@ class SB3ScholaModel(ScholaModel):
         # Get the input dim from the model
         # input_dim = gym.spaces.utils.flatten_space(model.observation_space).shape
         # Export the model to ONNX
-        # Pass the path as a string (not a file object) for compatibility with newer PyTorch ONNX exporters
-        # Use dynamo=False for legacy exporter which properly handles input_names parameter
-        th.onnx.export(
+        export_onnx(
             self,
             tuple(inputs),
-            str(export_path),
+            export_path,
             opset_version=onnx_opset,
             input_names=input_names,
             output_names=output_names,
             dynamic_axes={k: {0: "batch_size"} for k in input_names},
-            dynamo=False,
         )
         print("Model exported to ONNX")
 
@@ -259,6 +256,48 @@ def convert_ckpt_to_onnx_for_unreal(
     model.save_as_onnx(export_path)
 
 
+# submodules of on-policy actor critic policies (e.g. PPO) called by both forward and evaluate_actions
+_ACTOR_CRITIC_NETWORKS = (
+    "features_extractor",
+    "pi_features_extractor",
+    "vf_features_extractor",
+    "mlp_extractor",
+    "action_net",
+    "value_net",
+)
+# submodules of off-policy actors and critics (e.g. SAC), which train calls directly rather than through the policy
+_OFF_POLICY_NETWORKS = ("actor", "critic", "critic_target")
+_ACTOR_NETWORKS = ("features_extractor", "latent_pi", "mu", "log_std")
+
+
+def compile_policy_networks(policy: th.nn.Module, mode: str = "default") -> None:
+    """
+    Compile the networks of a stable baselines policy in place with torch.compile, so both rollouts and gradient updates run the compiled networks.
+
+    Compiling the policy itself only compiles its forward, which the gradient updates never call. The submodules are compiled in place, so the state dict keys (and therefore saved checkpoints) are unchanged.
+
+    Parameters
+    ----------
+    policy : stable_baselines3.common.policies.BasePolicy
+        The policy to compile, either an on-policy actor critic policy or an off-policy policy with separate actor and critic networks.
+    mode : str, default="default"
+        The torch.compile mode.
+    """
+    networks = [getattr(policy, name, None) for name in _ACTOR_CRITIC_NETWORKS]
+    for name in _OFF_POLICY_NETWORKS:
+        net = getattr(policy, name, None)
+        if net is not None:
+            networks.extend(getattr(net, sub_name, None) for sub_name in _ACTOR_NETWORKS)
+            networks.extend(getattr(net, "q_networks", ()))
+    compiled = set()
+    for network in networks:
+        # shared feature extractors are reachable under several names, compile each module once.
+        # log_std is a plain parameter rather than a module when using gSDE
+        if isinstance(network, th.nn.Module) and id(network) not in compiled:
+            compiled.add(id(network))
+            network.compile(mode=mode)
+
+
 @singledispatch
 def merge_spaces(space, *other_spaces):
     """
@@ -167,7 +167,7 @@ class gRPCProtocolArgs:
 
 IgnoreParameter = Parameter(show=False, parse=False)
 
-@dataclass
+@dataclass(slots=True)
 class CheckpointArgs:
     """
     Settings for checkpoints in Schola.
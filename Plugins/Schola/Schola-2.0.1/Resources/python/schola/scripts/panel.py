@@ -8,6 +8,7 @@ exceptions are handled explicitly.
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable, Union
 import sys
 from rich.console import Console
@@ -20,13 +21,17 @@ __all__ = [
     "print_info",
 ]
 
-_console = Console()
-
 STYLE_ERROR = "red"
 STYLE_WARNING = "yellow"
 STYLE_INFO = "cyan"
 
 
+@lru_cache(maxsize=1)
+def _get_console() -> Console:
+    # created on first print, so importing this module does not probe the terminal
+    return Console()
+
+
 def print_panel(message: Union[str, Iterable[str]], *, title: str = "", style: str = STYLE_INFO) -> None:
     """
     Print a panel with the given message and style.
@@ -41,8 +46,8 @@ def print_panel(message: Union[str, Iterable[str]], *, title: str = "", style: s
         The style of the panel, by default STYLE_INFO
     """
     if not isinstance(message, str):
-        message = "\n".join(str(m) for m in message)
-    _console.print(CycloptsPanel(message=message, title=title or "Message", style=style))
+        message = "\n".join(map(str, message))
+    _get_console().print(CycloptsPanel(message=message, title=title or "Message", style=style))
 
 
 def print_error(message: Union[str, Iterable[str]]) -> None:  # noqa: D401
@@ -2,9 +2,11 @@
 """
 This module contains the settings dataclasses for the RLlib script
 """
-from typing import Annotated, Any, Dict, List, Optional, Type, Union
+from typing import Annotated, Any, ClassVar, Dict, List, Optional, Type, Union
 from pathlib import Path
 from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import import_module
 
 from schola.scripts.common import (
     ActivationFunctionEnum,
@@ -16,16 +18,25 @@ from schola.scripts.common import (
 from cyclopts import App, Parameter, validators
 
 
+@lru_cache(maxsize=None)
+def _load_rllib_config(module: str, name: str) -> Type:
+    # ray is imported lazily, and each config class is only resolved once
+    return getattr(import_module(module), name)
+
+
 class RLLibAlgorithmSpecificSettings:
     """
     Base Class for RLLib algorithm specific settings. This class is intended to be inherited by specific algorithm settings classes (e.g., PPOSettings, IMPALASettings, etc.).
     """
 
+    _FIELD_MAP: ClassVar[Dict[str, str]] = {}
+    "Maps each settings attribute to its parameter name in Ray."
+
     def get_settings_dict(self) -> Dict[str, Any]:
         """
         Get the settings as a dictionary keyed by the correct parameter name in Ray
         """
-        ...
+        return {key: getattr(self, attr) for attr, key in self._FIELD_MAP.items()}
 
     @classmethod
     def get_parser(cls):
@@ -50,22 +61,20 @@ class PPOSettings(RLLibAlgorithmSpecificSettings):
     use_gae: bool = True
     "Whether to use Generalized Advantage Estimation (GAE) for advantage calculation. GAE is a method to reduce the variance of the advantage estimates while keeping bias low. If set to False, the standard advantage calculation will be used instead."
 
+    _FIELD_MAP: ClassVar[Dict[str, str]] = {
+        "gae_lambda": "lambda_",
+        "use_gae": "use_gae",
+        "clip_param": "clip_param",
+    }
+
     @property
     def rllib_config(self) -> Type["PPOConfig"]: # type: ignore
-        from ray.rllib.algorithms.ppo.ppo import PPOConfig
-        return PPOConfig
+        return _load_rllib_config("ray.rllib.algorithms.ppo.ppo", "PPOConfig")
 
     @property
     def name(self) -> str:
         return "PPO"
 
-    def get_settings_dict(self):
-        return {
-            "lambda_": self.gae_lambda,
-            "use_gae": self.use_gae,
-            "clip_param": self.clip_param,
-        }
-
 
 @dataclass
 class SACSettings(RLLibAlgorithmSpecificSettings):
@@ -88,24 +97,22 @@ class SACSettings(RLLibAlgorithmSpecificSettings):
     twin_q: bool = True
     "Whether to use twin Q networks (double Q-learning). This helps reduce overestimation bias in Q-value estimates."
 
+    _FIELD_MAP: ClassVar[Dict[str, str]] = {
+        "tau": "tau",
+        "target_entropy": "target_entropy",
+        "initial_alpha": "initial_alpha",
+        "n_step": "n_step",
+        "twin_q": "twin_q",
+    }
+
     @property
     def rllib_config(self) -> Type["SACConfig"]: # type: ignore
-        from ray.rllib.algorithms.sac.sac import SACConfig
-        return SACConfig
+        return _load_rllib_config("ray.rllib.algorithms.sac.sac", "SACConfig")
 
     @property
     def name(self) -> str:
         return "SAC"
 
-    def get_settings_dict(self):
-        return {
-            "tau": self.tau,
-            "target_entropy": self.target_entropy,
-            "initial_alpha": self.initial_alpha,
-            "n_step": self.n_step,
-            "twin_q": self.twin_q,
-        }
-
 
 @dataclass
 class IMPALASettings(RLLibAlgorithmSpecificSettings):
@@ -122,22 +129,20 @@ class IMPALASettings(RLLibAlgorithmSpecificSettings):
     vtrace_clip_pg_rho_threshold: Annotated[float, Parameter(validator=validators.Number(gte=0.0))] = 1.0
     "The clip threshold for V-trace rho values in the policy gradient."
 
+    _FIELD_MAP: ClassVar[Dict[str, str]] = {
+        "vtrace": "vtrace",
+        "vtrace_clip_rho_threshold": "vtrace_clip_rho_threshold",
+        "vtrace_clip_pg_rho_threshold": "vtrace_clip_pg_rho_threshold",
+    }
+
     @property
     def rllib_config(self) -> Type["IMPALAConfig"]: # type: ignore
-        from ray.rllib.algorithms.impala.impala import IMPALAConfig
-        return IMPALAConfig
+        return _load_rllib_config("ray.rllib.algorithms.impala.impala", "IMPALAConfig")
 
     @property
     def name(self) -> str:
         return "IMPALA"
 
-    def get_settings_dict(self):
-        return {
-            "vtrace": self.vtrace,
-            "vtrace_clip_rho_threshold": self.vtrace_clip_rho_threshold,
-            "vtrace_clip_pg_rho_threshold": self.vtrace_clip_pg_rho_threshold,
-        }
-
 
 @dataclass
 class APPOSettings(IMPALASettings, PPOSettings):
@@ -145,18 +150,16 @@ class APPOSettings(IMPALASettings, PPOSettings):
     Dataclass for APPO (Asynchronous Proximal Policy Optimization) algorithm specific settings. This class inherits from both IMPALASettings and PPOSettings to combine the settings for both algorithms. This allows for the use of both V-trace for off-policy correction and PPO for policy optimization in a single algorithm.
     """
 
+    _FIELD_MAP: ClassVar[Dict[str, str]] = IMPALASettings._FIELD_MAP | PPOSettings._FIELD_MAP
+
     @property
     def rllib_config(self) -> Type["APPOConfig"]: # type: ignore
-        from ray.rllib.algorithms.appo.appo import APPOConfig
-        return APPOConfig
+        return _load_rllib_config("ray.rllib.algorithms.appo.appo", "APPOConfig")
 
     @property
     def name(self) -> str:
         return "APPO"
 
-    def get_settings_dict(self):
-        return {**IMPALASettings.get_settings_dict(self), **PPOSettings.get_settings_dict(self)}
-
 @dataclass
 class TrainingSettings:
     """
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Annotated, List, Optional, Type, Union, Any
+from typing import Annotated, List, Literal, Optional, Type, Union, Any
 
 from schola.scripts.common import (
     ActivationFunctionEnum,
@@ -11,20 +11,54 @@ from schola.scripts.common import (
     Sb3LauncherExtension,
 )
 from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
 from cyclopts import App, Parameter, validators
 
 from cyclopts import types
 
-@dataclass
+# keyword arguments of the default SB3 ReplayBuffer that may be passed through replay_buffer_kwargs
+_SAC_RB_ALLOWED = frozenset({"handle_timeout_termination"})
+_SAC_RB_ALLOWED_SORTED = tuple(sorted(_SAC_RB_ALLOWED))
+# arguments supplied internally by the algorithm / env setup
+_SAC_RB_RESERVED = frozenset({
+    "buffer_size",
+    "observation_space",
+    "action_space",
+    "device",
+    "n_envs",
+    "optimize_memory_usage",
+})
+
+# validators shared by the settings fields below
+_POS_FLOAT = validators.Number(gt=0.0)
+_NN_FLOAT = validators.Number(gte=0.0)
+_UNIT_FLOAT = validators.Number(gte=0.0, lte=1.0)
+_POS_INT = validators.Number(gte=1)
+_NN_INT = validators.Number(gte=0)
+_V012 = validators.Number(gte=0, lte=2)
+_EXISTING_FILE = validators.Path(exists=True, file_okay=True, dir_okay=False)
+
+_ACTIVATIONS_SET = frozenset(ActivationFunctionEnum)
+_ACTIVATIONS_TUPLE = tuple(ActivationFunctionEnum)
+
+
+@lru_cache(maxsize=None)
+def _load_sb3_algorithm(name: str) -> Type:
+    # stable_baselines3 is imported lazily, and each algorithm class is only resolved once
+    return getattr(import_module("stable_baselines3"), name)
+
+
+@dataclass(slots=True)
 class BaseSb3AlgorithmArgs:
-    learning_rate: Annotated[float, Parameter(validator=validators.Number(gt=0.0))] = 0.0003
+    learning_rate: Annotated[float, Parameter(validator=_POS_FLOAT)] = 0.0003
     "Learning rate for the optimizer."
 
-    n_steps: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 2048
+    n_steps: Annotated[int, Parameter(validator=_POS_INT)] = 2048
     "Number of steps to run for each environment per update. This is the number of timesteps collected before updating the policy."
 
-    batch_size: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 64
+    batch_size: Annotated[int, Parameter(validator=_POS_INT)] = 64
     "Minibatch size for each update. This is the number of timesteps used in each batch for training the policy. Must be a divisor of `n_steps`."
 
     def __post_init__(self):
@@ -34,34 +68,34 @@ class BaseSb3AlgorithmArgs:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class PPOSettings(BaseSb3AlgorithmArgs):
     """
     Dataclass for configuring the settings of the Proximal Policy Optimization (PPO) algorithm. This includes parameters for the learning process, such as learning rate, batch size, number of steps, and other hyperparameters that control the behavior of the PPO algorithm.
     """
 
-    n_epochs: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 10
+    n_epochs: Annotated[int, Parameter(validator=_POS_INT)] = 10
     "Number of epochs to update the policy. This is the number of times the model will iterate over the collected data during training. More epochs can lead to better convergence but also overfitting."
 
-    gamma: Annotated[float, Parameter(validator=validators.Number(gte=0.0, lte=1.0))] = 0.99
+    gamma: Annotated[float, Parameter(validator=_UNIT_FLOAT)] = 0.99
     "Discount factor for future rewards. This determines how much the agent values future rewards compared to immediate rewards. A value of 0.99 means that future rewards are discounted by 1% per time step."
 
-    gae_lambda: Annotated[float, Parameter(validator=validators.Number(gte=0.0, lte=1.0))] = 0.95
+    gae_lambda: Annotated[float, Parameter(validator=_UNIT_FLOAT)] = 0.95
     "Lambda parameter for Generalized Advantage Estimation (GAE). This parameter helps to balance bias and variance in the advantage estimation. A value of 1.0 corresponds to standard advantage estimation, while lower values will reduce variance but may introduce bias."
 
-    clip_range: Annotated[float, Parameter(validator=validators.Number(gte=0.0))] = 0.2
+    clip_range: Annotated[float, Parameter(validator=_NN_FLOAT)] = 0.2
     "Clipping range for the policy update. This is the maximum amount by which the new policy can differ from the old policy during training. This helps to prevent large updates that can destabilize training."
 
     normalize_advantage: bool = True
     "Whether to normalize the advantages. Normalizing the advantages can help to stabilize training by ensuring that they have a mean of 0 and a standard deviation of 1. This can lead to more consistent updates to the policy."
 
-    ent_coef: Annotated[float, Parameter(validator=validators.Number(gte=0.0))] = 0.0
+    ent_coef: Annotated[float, Parameter(validator=_NN_FLOAT)] = 0.0
     "Coefficient for the entropy term in the loss function. This encourages exploration by adding a penalty for certainty in the policy's action distribution. A higher value will encourage more exploration, while a lower value will make the policy more deterministic. Set to 0.0 to disable entropy regularization."
 
-    vf_coef: Annotated[float, Parameter(validator=validators.Number(gte=0.0))] = 0.5
+    vf_coef: Annotated[float, Parameter(validator=_NN_FLOAT)] = 0.5
     "Coefficient for the value function loss in the overall loss function. This determines how much weight is given to the value function loss compared to the policy loss. A higher value will put more emphasis on accurately estimating the value function, while a lower value will prioritize the policy update."
 
-    max_grad_norm: Annotated[float, Parameter(validator=validators.Number(gte=0.0))] = 0.5
+    max_grad_norm: Annotated[float, Parameter(validator=_NN_FLOAT)] = 0.5
     "Maximum gradient norm for clipping. This is used to prevent exploding gradients by scaling down the gradients if their norm exceeds this value. This can help to stabilize training, especially in environments with high variance in the rewards or gradients."
 
     use_sde: bool = False
@@ -71,7 +105,8 @@ class PPOSettings(BaseSb3AlgorithmArgs):
     "Frequency at which to sample the SDE noise. This determines how often the noise is sampled when using State Dependent Exploration (SDE). A value of -1 means that it will sample the noise at every step, while a positive integer will specify the number of steps between samples. This can help to control the exploration behavior of the agent."
 
     def __post_init__(self):
-        super().__post_init__()
+        # slotted dataclasses are rebuilt as new classes, so zero-argument super() would reference the stale class
+        BaseSb3AlgorithmArgs.__post_init__(self)
         if self.normalize_advantage and self.batch_size <= 1:
             raise ValueError("normalize_advantage=True requires batch_size > 1 to compute a valid variance.")
         if self.sde_sample_freq != -1 and self.sde_sample_freq <= 0:
@@ -79,8 +114,7 @@ class PPOSettings(BaseSb3AlgorithmArgs):
 
     @property
     def constructor(self) -> Type["PPO"]: # type: ignore
-        from stable_baselines3 import PPO
-        return PPO
+        return _load_sb3_algorithm("PPO")
 
     @property
     def critic_type(self) -> str:
@@ -91,34 +125,34 @@ class PPOSettings(BaseSb3AlgorithmArgs):
         return "PPO"
 
 
-@dataclass
+@dataclass(slots=True)
 class SACSettings(BaseSb3AlgorithmArgs):
     """
     Dataclass for configuring the settings of the Soft Actor-Critic (SAC) algorithm. This includes parameters for the learning process, such as learning rate, buffer size, batch size, and other hyperparameters that control the behavior of the SAC algorithm.
     """
 
-    learning_rate: Annotated[float, Parameter(validator=validators.Number(gt=0.0))] = 0.0003
+    learning_rate: Annotated[float, Parameter(validator=_POS_FLOAT)] = 0.0003
     "Learning rate for the optimizer. This controls how much to adjust the model parameters in response to the estimated error each time the model weights are updated. A lower value means slower learning, while a higher value means faster learning."
 
-    buffer_size: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 1000000
+    buffer_size: Annotated[int, Parameter(validator=_POS_INT)] = 1000000
     "Size of the replay buffer. This is the number of transitions (state, action, reward, next state) that can be stored in the buffer. A larger buffer allows for more diverse samples to be used for training, which can improve performance but also increases memory usage."
 
-    learning_starts: Annotated[int, Parameter(validator=validators.Number(gte=0))] = 100
+    learning_starts: Annotated[int, Parameter(validator=_NN_INT)] = 100
     "Number of timesteps before learning starts. This is the number of steps to collect in the replay buffer before the first update to the policy. This allows the agent to gather initial experience and helps to stabilize training by ensuring that there are enough samples to learn from."
 
-    batch_size: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 256
+    batch_size: Annotated[int, Parameter(validator=_POS_INT)] = 256
     "Minibatch size for each update. This is the number of samples drawn from the replay buffer to perform a single update to the policy. A larger batch size can lead to more stable updates but requires more memory. Must be less than or equal to `buffer_size`."
 
-    tau: Annotated[float, Parameter(validator=validators.Number(gte=0.0, lte=1.0))] = 0.005
+    tau: Annotated[float, Parameter(validator=_UNIT_FLOAT)] = 0.005
     "Soft update parameter for the target networks. This controls how much the target networks are updated towards the main networks during training. A smaller value (e.g., 0.005) means that the target networks are updated slowly, which can help to stabilize training. This is typically a small value between 0 and 1."
 
-    gamma: Annotated[float, Parameter(validator=validators.Number(gte=0.0, lte=1.0))] = 0.99
+    gamma: Annotated[float, Parameter(validator=_UNIT_FLOAT)] = 0.99
     "Discount factor for future rewards. This determines how much the agent values future rewards compared to immediate rewards. A value of 0.99 means that future rewards are discounted by 1% per time step. This is important for balancing the trade-off between short-term and long-term rewards in reinforcement learning."
 
-    train_freq: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 1
+    train_freq: Annotated[int, Parameter(validator=_POS_INT)] = 1
     "Frequency of training the policy. This determines how often the model is updated during training. A value of 1 means that the model is updated every time step, while a higher value (e.g., 2) means that the model is updated every other time step. This can help to control the trade-off between exploration and exploitation during training."
 
-    gradient_steps: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 1
+    gradient_steps: Annotated[int, Parameter(validator=_POS_INT)] = 1
     "Number of gradient steps to take during each training update. This specifies how many times to update the model parameters using the sampled minibatch from the replay buffer. A value of 1 means that the model is updated once per training step, while a higher value (e.g., 2) means that the model is updated multiple times. This can help to improve convergence but may also lead to overfitting if set too high."
 
     replay_buffer_kwargs: Optional[dict] = None
@@ -130,7 +164,7 @@ class SACSettings(BaseSb3AlgorithmArgs):
     ent_coef: Any = "auto"
     "Coefficient for the entropy term in the loss function. This encourages exploration by adding a penalty for certainty in the policy's action distribution. A higher value will encourage more exploration, while a lower value will make the policy more deterministic. When set to 'auto', it will automatically adjust the coefficient based on the average entropy of the actions taken by the policy. This can help to balance exploration and exploitation during training."
 
-    target_update_interval: Annotated[int, Parameter(validator=validators.Number(gte=1))] = 1
+    target_update_interval: Annotated[int, Parameter(validator=_POS_INT)] = 1
     "Interval for updating the target networks. This determines how often the target networks are updated with the main networks' weights. A value of 1 means that the target networks are updated every training step, while a higher value (e.g., 2) means that they are updated every other step. This can help to control the stability of training by ensuring that the target networks are kept up-to-date with the latest policy parameters."
 
     target_entropy: Any = "auto"
@@ -144,8 +178,7 @@ class SACSettings(BaseSb3AlgorithmArgs):
 
     @property
     def constructor(self) -> Type["SAC"]: # type: ignore
-        from stable_baselines3 import SAC
-        return SAC
+        return _load_sb3_algorithm("SAC")
 
     @property
     def critic_type(self) -> str:
@@ -156,7 +189,7 @@ class SACSettings(BaseSb3AlgorithmArgs):
         return "SAC"
     
     def __post_init__(self):
-        super().__post_init__()
+        BaseSb3AlgorithmArgs.__post_init__(self)
         if self.batch_size > self.buffer_size:
             raise ValueError(
                 f"batch_size ({self.batch_size}) must be <= buffer_size ({self.buffer_size})."
@@ -170,31 +203,19 @@ class SACSettings(BaseSb3AlgorithmArgs):
                 f"Invalid sde_sample_freq={self.sde_sample_freq}. Must be -1 (every step) or a positive integer (>0)."
             )
         # Validate replay_buffer_kwargs according to supported parameters of the default SB3 ReplayBuffer
-        if self.replay_buffer_kwargs is not None:
-            if not isinstance(self.replay_buffer_kwargs, dict):
-                raise ValueError(
-                    "replay_buffer_kwargs must be a dict or None (got type "
-                    f"{type(self.replay_buffer_kwargs).__name__})."
-                )
-
-            allowed_keys = {"handle_timeout_termination"}
-            reserved_keys = {
-                # Arguments supplied internally by the algorithm / env setup
-                "buffer_size",
-                "observation_space",
-                "action_space",
-                "device",
-                "n_envs",
-                "optimize_memory_usage",
-            }
-            provided_keys = set(self.replay_buffer_kwargs.keys())
-
+        if self.replay_buffer_kwargs is not None and not isinstance(self.replay_buffer_kwargs, dict):
+            raise ValueError(
+                "replay_buffer_kwargs must be a dict or None (got type "
+                f"{type(self.replay_buffer_kwargs).__name__})."
+            )
+        # None and empty dicts have no keys to check
+        if self.replay_buffer_kwargs:
             # Reject unknown keys (anything not explicitly allowed). This also covers reserved keys.
-            unknown = provided_keys - allowed_keys
+            unknown = self.replay_buffer_kwargs.keys() - _SAC_RB_ALLOWED
             if unknown:
                 raise KeyError(
                     "Unsupported keys in replay_buffer_kwargs: "
-                    f"{sorted(unknown)}. Allowed keys: {sorted(allowed_keys)}."
+                    f"{sorted(unknown)}. Allowed keys: {list(_SAC_RB_ALLOWED_SORTED)}."
                 )
 
             # Type checks for allowed keys
@@ -214,19 +235,19 @@ class SACSettings(BaseSb3AlgorithmArgs):
         #     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Sb3ResumeArgs:
     """
     Dataclass for holding arguments related to resuming training from a saved state.
     """
 
-    resume_from: Annotated[Optional[Path], Parameter(validator=validators.Path(exists=True, file_okay=True, dir_okay=False))] = None
+    resume_from: Annotated[Optional[Path], Parameter(validator=_EXISTING_FILE)] = None
     "Path to a saved model to resume training from. This allows for continuing training from a previously saved checkpoint. The path should point to a valid model file created by Stable Baselines3. If set to None, training will start from scratch."
 
-    load_vecnormalize: Annotated[Optional[Path], Parameter(validator=validators.Path(exists=True, file_okay=True, dir_okay=False))] = None
+    load_vecnormalize: Annotated[Optional[Path], Parameter(validator=_EXISTING_FILE)] = None
     "Path to a saved vector normalization statistics file to load when resuming training. This allows for loading the normalization statistics from a previous training session, ensuring that the observations are normalized consistently when resuming training. If set to None, it will not load any vector normalization statistics."
 
-    load_replay_buffer: Annotated[Optional[Path], Parameter(validator=validators.Path(exists=True, file_okay=True, dir_okay=False))] = None
+    load_replay_buffer: Annotated[Optional[Path], Parameter(validator=_EXISTING_FILE)] = None
     "Path to a saved replay buffer to load when resuming training. This allows for loading a previously saved replay buffer, which can be useful for continuing training with the same set of experiences. The path should point to a valid replay buffer file created by Stable Baselines3. If set to None, it will not load any replay buffer, and a new one will be created instead."
 
     reset_timestep: bool = False
@@ -234,7 +255,7 @@ class Sb3ResumeArgs:
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Sb3LoggingArgs:
     """
     Dataclass for configuring logging settings for the training process.
@@ -246,29 +267,29 @@ class Sb3LoggingArgs:
     log_dir: types.Directory = Path("./logs")
     "Directory to save TensorBoard logs. (Will be created if it doesn't exist when tensorboard is enabled.)"
 
-    log_freq: Annotated[int, Parameter(validator=validators.Number(gte=0))] = 10
+    log_freq: Annotated[int, Parameter(validator=_NN_INT)] = 10
     "Frequency of logging training metrics to TensorBoard. This determines how often (in terms of training steps) the training metrics will be logged to TensorBoard. A value of 10 means that every 10 training steps, the metrics will be recorded."
 
-    callback_verbosity: Annotated[int, Parameter(validator=validators.Number(gte=0, lte=2))] = 0
+    callback_verbosity: Annotated[int, Parameter(validator=_V012)] = 0
     "Verbosity level for callbacks. This controls the level of detail in the output from any callbacks used during training."
 
-    schola_verbosity: Annotated[int, Parameter(validator=validators.Number(gte=0, lte=2))] = 0
+    schola_verbosity: Annotated[int, Parameter(validator=_V012)] = 0
     "Verbosity level for Schola-specific logging. This controls the level of detail in the output from Schola-related components during training."
 
-    sb3_verbosity: Annotated[int, Parameter(validator=validators.Number(gte=0, lte=2))] = 1
+    sb3_verbosity: Annotated[int, Parameter(validator=_V012)] = 1
     "Verbosity level for Stable Baselines3 logging. This controls the level of detail in the output from Stable Baselines3 components during training."
 
     def __post_init__(self):
-        # create log_dir eagerly only if tensorboard will be used
-        if self.enable_tensorboard and self.log_dir.exists() is False:
+        # create log_dir eagerly only if tensorboard will be used, mkdir already no-ops when it exists
+        if self.enable_tensorboard:
             try:
                 self.log_dir.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
+            except OSError as e:
                 raise RuntimeError(
                     f"Failed to create TensorBoard log directory '{self.log_dir}': {e}"
                 ) from e
 
-@dataclass
+@dataclass(slots=True)
 class Sb3CheckpointArgs(CheckpointArgs):
 
     save_replay_buffer: bool = False
@@ -278,7 +299,7 @@ class Sb3CheckpointArgs(CheckpointArgs):
     "Whether to save the vector normalization statistics when saving a checkpoint. This is useful for environments where observations need to be normalized, and it allows for consistent normalization when resuming training."
 
 
-@dataclass
+@dataclass(slots=True)
 class Sb3NetworkArchitectureArgs:
 
     policy_parameters: Annotated[List[int],Parameter(consume_multiple=True)] = field(default_factory=lambda : [256,256])
@@ -291,14 +312,15 @@ class Sb3NetworkArchitectureArgs:
     "Activation function to use in the policy and critic networks. This determines the non-linear activation function applied to each layer of the neural networks. The choice of activation function can affect the performance of the model and may depend on the specific characteristics of the environment."
 
     def __post_init__(self):
-        if self.activation not in list(ActivationFunctionEnum):
+        # cyclopts already rejects unknown names, this guards settings constructed directly in code
+        if self.activation not in _ACTIVATIONS_SET:
             raise ValueError(
-                f"activation must be one of {list(ActivationFunctionEnum)} (got '{self.activation}')."
+                f"activation must be one of {list(_ACTIVATIONS_TUPLE)} (got '{self.activation}')."
             )
             
 IgnoreParameter = Parameter(show=False, parse=False)
 
-@dataclass
+@dataclass(slots=True)
 class SB3ScriptArgs:
     """
     Top level dataclass for configuring the script arguments used in the SB3 launcher. 
@@ -314,6 +336,30 @@ class SB3ScriptArgs:
     disable_eval: bool = False
     "Whether to disable running evaluation after training. When set to True, it will skip evaluation after training completes."
 
+    eval_episodes: Annotated[int, Parameter(validator=_POS_INT)] = 10
+    "Minimum number of episodes to run when evaluating after training. This is rounded up to a multiple of the number of environments, so every environment runs the same number of episodes in parallel."
+
+    compile_model: bool = False
+    "Whether to compile the networks of the policy with torch.compile before training, covering both the rollouts and the gradient updates. This can speed up training of larger networks (e.g. CNN policies on image observations), but adds a compilation delay at startup and gives little benefit for small MLP policies."
+
+    compile_mode: Literal["default", "reduce-overhead", "max-autotune"] = "default"
+    "The torch.compile mode to use when `compile_model` is enabled. reduce-overhead captures CUDA graphs, which are re-recorded for every distinct batch size, e.g. the number of environments during rollouts and the minibatch size during updates."
+
+    use_ipex: bool = False
+    "Whether to optimize the policy with Intel Extension for PyTorch before training. Only applies when training on the CPU with an algorithm whose policy has a single optimizer (e.g. PPO). Requires intel_extension_for_pytorch to be installed."
+
+    ipex_dtype: Literal["fp32", "bf16"] = "fp32"
+    "The dtype to optimize the policy for when `use_ipex` is enabled. bf16 also runs the policy under CPU autocast, returning fp32 outputs to SB3, which is faster on CPUs with AVX-512 BF16 or AMX support at the cost of some precision."
+
+    mixed_precision: Literal["fp32", "bf16", "fp16"] = "fp32"
+    "The precision of the gradient updates. bf16 and fp16 run the networks under torch.autocast during the updates, which speeds up the matmuls on GPUs and on CPUs with AVX-512 BF16 or AMX support at the cost of some precision. Rollouts are still collected in fp32. fp16 scales the losses with a GradScaler to avoid underflowing gradients."
+
+    numba_gae: bool = False
+    "Whether to compute the advantages of on-policy algorithms (e.g. PPO) with a Numba compiled kernel instead of a Python loop over the rollout steps. Requires numba to be installed."
+
+    replay_buffer_memmap_dir: Optional[types.ExistingDirectory] = None
+    "Directory to store the observations of off-policy replay buffers (e.g. SAC) in, as memory mapped temporary files. This allows replay buffers larger than the available RAM, at the cost of disk I/O. If set to None, the replay buffer is kept in memory. Only supported for non-dictionary observation spaces."
+
     logging_settings: Annotated[
         Sb3LoggingArgs, Parameter(group="Logging Arguments",name="*")
     ] = field(default_factory=Sb3LoggingArgs)
@@ -3,7 +3,10 @@
 """
 Script to train a Stable Baselines3 model using Schola.
 """
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import fields
+import math
 import os
 import logging
 from typing import Literal, Optional, Tuple
@@ -30,6 +33,13 @@ if not logging.getLogger().handlers:
 logger = logging.getLogger(__name__)
 
 
+_SMALL_IMG_MSG = (
+    "Image observation detected with shape {shape}; min dimension < {threshold}. "
+    "The default SB3 CNN may fail or produce poor features. Consider resizing "
+    "or providing a custom features_extractor."
+)
+
+
 def warn_if_small_image_observation(observation_space, threshold: int = 64):
     """Issue a panel warning if any Box observation that looks image-like has
     a spatial dimension smaller than `threshold`.
@@ -40,33 +50,31 @@ def warn_if_small_image_observation(observation_space, threshold: int = 64):
     """
     import gymnasium as gym
 
-    def _iter_box_spaces(space):
-        if isinstance(space, gym.spaces.Box):
-            yield space
-        elif isinstance(space, gym.spaces.Dict):
-            for s in space.spaces.values():
-                yield from _iter_box_spaces(s)
-        elif isinstance(space, gym.spaces.Tuple):
-            for s in space.spaces:
-                yield from _iter_box_spaces(s)
-
-    for box in _iter_box_spaces(observation_space):
-        shape = box.shape
-        if len(shape) == 2:
-            h, w = shape
-        elif len(shape) == 3:
-            # Two largest dims are spatial (robust to (C,H,W) vs (H,W,C)).
-            h, w = sorted(shape, reverse=True)[:2]
-        else:
-            continue
-
-        if min(h, w) < threshold:
-            print_error(
-                f"Image observation detected with shape {shape}; min dimension < {threshold}. "
-                "The default SB3 CNN may fail or produce poor features. Consider resizing "
-                "or providing a custom features_extractor."
-            )
-            break
+    # bind the space classes once, the names differ from the typing imports to avoid shadowing them
+    BoxSpace, DictSpace, TupleSpace = gym.spaces.Box, gym.spaces.Dict, gym.spaces.Tuple
+    # walk the space tree with an explicit stack rather than nested generators, checking each Box as it is
+    # reached so the walk stops at the first small image. Children are pushed in reverse to keep declaration order
+    stack = [observation_space]
+    while stack:
+        space = stack.pop()
+        if isinstance(space, BoxSpace):
+            shape = space.shape
+            if len(shape) == 2:
+                min_dim = min(shape)
+            elif len(shape) == 3:
+                # Two largest dims are spatial (robust to (C,H,W) vs (H,W,C)),
+                # so the smaller spatial dim is the middle one, found without sorting.
+                min_dim = sum(shape) - max(shape) - min(shape)
+            else:
+                continue
+
+            if min_dim < threshold:
+                print_error(_SMALL_IMG_MSG.format(shape=shape, threshold=threshold))
+                return
+        elif isinstance(space, DictSpace):
+            stack.extend(reversed(space.spaces.values()))
+        elif isinstance(space, TupleSpace):
+            stack.extend(reversed(space.spaces))
 
 
 def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
@@ -105,17 +113,11 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
             logger.warning("tensorboard not installed. Disabling tensorboard logging")
             args.logging_settings.enable_tensorboard = False
     
-    from schola.sb3.utils import convert_ckpt_to_onnx_for_unreal
+    # only the modules needed on every run are imported here, optional steps import their own dependencies
     import gymnasium as gym
-    from stable_baselines3.common.evaluation import evaluate_policy
-    from stable_baselines3.common.vec_env import VecNormalize
-
-    from schola.scripts.sb3.utils import RewardCallback, CustomProgressBarCallback
     from schola.sb3.env import VecEnv
     from schola.sb3.utils import VecMergeDictActionWrapper
     from schola.core.error_manager import ScholaErrorContextManager
-    from stable_baselines3.common.callbacks import CheckpointCallback
-    from stable_baselines3.common.vec_env.vec_monitor import VecMonitor
     
     from stable_baselines3.common import utils
     
@@ -173,6 +175,33 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
                     if args.network_architecture_settings.policy_parameters:
                         policy_kwargs["net_arch"]["pi"] = args.network_architecture_settings.policy_parameters
 
+                # the settings hold no nested dataclasses, so a shallow dict is enough and skips the deepcopy done by asdict
+                algorithm_kwargs = {
+                    f.name: getattr(args.algorithm_settings, f.name) for f in fields(args.algorithm_settings)
+                }
+                if args.numba_gae:
+                    if not isinstance(args.algorithm_settings, PPOSettings):
+                        logging.warning("numba_gae only applies to on-policy algorithms. Skipping")
+                    else:
+                        try:
+                            import numba
+                        except ImportError:
+                            logging.warning("numba not installed. Computing advantages with the default RolloutBuffer")
+                        else:
+                            from schola.sb3.buffers import NumbaRolloutBuffer
+                            algorithm_kwargs["rollout_buffer_class"] = NumbaRolloutBuffer
+
+                if args.replay_buffer_memmap_dir is not None:
+                    if not isinstance(args.algorithm_settings, SACSettings) or isinstance(env.observation_space, gym.spaces.Dict):
+                        logging.warning("replay_buffer_memmap_dir only applies to off-policy algorithms with non-dictionary observations. Skipping")
+                    else:
+                        from schola.sb3.buffers import MemmapReplayBuffer
+                        algorithm_kwargs["replay_buffer_class"] = MemmapReplayBuffer
+                        algorithm_kwargs["replay_buffer_kwargs"] = {
+                            **(algorithm_kwargs["replay_buffer_kwargs"] or {}),
+                            "memmap_dir": str(args.replay_buffer_memmap_dir),
+                        }
+
                 model = args.algorithm_settings.constructor(
                     policy=(
                         "MultiInputPolicy"
@@ -182,10 +211,49 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
                     env=env,
                     verbose=args.logging_settings.sb3_verbosity,
                     policy_kwargs=policy_kwargs,
-                    **asdict(args.algorithm_settings),
+                    **algorithm_kwargs,
                 )
 
+            learn_context = nullcontext()
+            if args.use_ipex:
+                optimizer = getattr(model.policy, "optimizer", None)
+                if model.device.type != "cpu" or optimizer is None:
+                    logging.warning("IPEX optimization requires training on the CPU with a single policy optimizer. Skipping IPEX optimization")
+                else:
+                    try:
+                        import intel_extension_for_pytorch as ipex
+                    except ImportError:
+                        logging.warning("intel_extension_for_pytorch not installed. Skipping IPEX optimization")
+                    else:
+                        import torch as th
+                        dtype = th.bfloat16 if args.ipex_dtype == "bf16" else th.float32
+                        # optimize in place, since the algorithm holds references to the policy's submodules
+                        _, model.policy.optimizer = ipex.optimize(model.policy, optimizer=optimizer, dtype=dtype, inplace=True)
+                        if args.ipex_dtype == "bf16":
+                            from schola.sb3.amp import autocast_training
+                            # ipex stores the weights in bf16, so the rollouts also run under autocast and return fp32 to SB3
+                            learn_context = autocast_training(model, th.bfloat16, include_rollouts=True)
+
+            if args.mixed_precision != "fp32":
+                if not isinstance(learn_context, nullcontext):
+                    logging.warning("IPEX bf16 optimization already trains under autocast. Skipping mixed_precision")
+                else:
+                    import torch as th
+                    from schola.sb3.amp import autocast_training
+                    dtype = th.bfloat16 if args.mixed_precision == "bf16" else th.float16
+                    if dtype == th.bfloat16 and model.device.type == "cuda" and not th.cuda.is_bf16_supported():
+                        logging.warning("bf16 is not supported on this GPU, mixed precision training may be slower than fp32")
+                    # only the gradient updates are autocast, the rollouts are collected in fp32
+                    learn_context = autocast_training(model, dtype)
+
+            if args.compile_model:
+                from schola.sb3._precompile import use_persistent_inductor_cache
+                use_persistent_inductor_cache()
+                from schola.sb3.utils import compile_policy_networks
+                compile_policy_networks(model.policy, mode=args.compile_mode)
+
             if args.resume_settings.load_vecnormalize:
+                from stable_baselines3.common.vec_env import VecNormalize
                 if model.get_vec_normalize_env() is None:
                     try:
                         VecNormalize.load(args.resume_settings.load_vecnormalize, env)
@@ -219,6 +287,7 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
             model.set_logger(logger)
 
             if args.logging_settings.enable_tensorboard:
+                from schola.scripts.sb3.utils import RewardCallback
                 reward_callback = RewardCallback(
                     verbose=args.logging_settings.callback_verbosity,
                     frequency=args.logging_settings.log_freq,
@@ -227,6 +296,7 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
                 callbacks.append(reward_callback)
 
             if args.checkpoint_settings.enable_checkpoints:
+                from stable_baselines3.common.callbacks import CheckpointCallback
                 ckpt_callback = CheckpointCallback(
                     save_freq=args.checkpoint_settings.save_freq,
                     save_path=args.checkpoint_settings.checkpoint_dir,
@@ -237,43 +307,59 @@ def main(args: SB3ScriptArgs) -> Optional[Tuple[float, float]]:
                 callbacks.append(ckpt_callback)
 
             if args.pbar:
+                from schola.scripts.sb3.utils import CustomProgressBarCallback
                 pbar_callback = CustomProgressBarCallback()
                 callbacks.append(pbar_callback)
 
-            model.learn(
-                total_timesteps=args.timesteps,
-                callback=callbacks,
-                reset_num_timesteps=args.resume_settings.reset_timestep,
-                log_interval=args.logging_settings.log_freq,
-            )
+            with learn_context:
+                model.learn(
+                    total_timesteps=args.timesteps,
+                    callback=callbacks,
+                    reset_num_timesteps=args.resume_settings.reset_timestep,
+                    log_interval=args.logging_settings.log_freq,
+                )
 
             if args.checkpoint_settings.save_final_policy:
                 logging.info("... Saving final policy checkpoint")
-                model.save(
-                    os.path.join(args.checkpoint_settings.checkpoint_dir, f"{args.name_prefix}_final.zip")
-                )
+                final_path = os.path.join(args.checkpoint_settings.checkpoint_dir, f"{args.name_prefix}_final.zip")
+                vec_normalize_env = model.get_vec_normalize_env() if args.checkpoint_settings.save_vecnormalize else None
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    # the normalization statistics are independent of the policy, so write them while the policy is saved
+                    vec_normalize_future = None
+                    if vec_normalize_env is not None:
+                        vec_normalize_future = pool.submit(
+                            vec_normalize_env.save,
+                            os.path.join(
+                                args.checkpoint_settings.checkpoint_dir,
+                                f"{args.name_prefix}_vec_normalize_final.zip",
+                            ),
+                        )
+
+                    model.save(final_path)
 
-                if args.checkpoint_settings.save_vecnormalize and model.get_vec_normalize_env() is not None:
-                    model.get_vec_normalize_env().save(
-                        os.path.join(
-                            args.checkpoint_settings.checkpoint_dir,
-                            f"{args.name_prefix}_vec_normalize_final.zip",
+                    if args.checkpoint_settings.export_onnx:
+                        from schola.sb3.utils import convert_ckpt_to_onnx_for_unreal
+                        logging.info("... Exporting final policy to ONNX")
+                        # the export reloads the policy from the saved zip, so it has to wait for model.save
+                        convert_ckpt_to_onnx_for_unreal(
+                            model,
+                            final_path,
+                            f"{args.checkpoint_settings.checkpoint_dir}/{args.name_prefix}_final.onnx",
                         )
-                    )
 
-                if args.checkpoint_settings.export_onnx:
-                    logging.info("... Exporting final policy to ONNX")
-                    convert_ckpt_to_onnx_for_unreal(
-                        model,
-                        f"{args.checkpoint_settings.checkpoint_dir}/{args.name_prefix}_final.zip",
-                        f"{args.checkpoint_settings.checkpoint_dir}/{args.name_prefix}_final.onnx",
-                    )
+                    if vec_normalize_future is not None:
+                        vec_normalize_future.result()
 
             if not args.disable_eval:
+                from stable_baselines3.common.evaluation import evaluate_policy
+                from stable_baselines3.common.vec_env.vec_monitor import VecMonitor
                 logging.info("... Evaluating the model")
-                env_with_monitor = VecMonitor(env)
+                # reuse an existing monitor rather than stacking a second one on top
+                env_with_monitor = env if isinstance(env, VecMonitor) else VecMonitor(env)
+                # evaluate_policy splits the episodes across the envs, so round up to keep every env busy until the end
+                n_eval_episodes = math.ceil(args.eval_episodes / env.num_envs) * env.num_envs
                 mean_reward, std_reward = evaluate_policy(
-                    model, env_with_monitor, n_eval_episodes=10, deterministic=True
+                    model, env_with_monitor, n_eval_episodes=n_eval_episodes, deterministic=True
                 )
                 
                 logging.info("Evaluation complete: mean_reward={:.2f} +/- {:.2f}".format(mean_reward, std_reward))
@@ -19,6 +19,9 @@ import logging
 import shutil
 import subprocess
 import sys
+import threading
+from collections import deque
+from itertools import chain
 from pathlib import Path
 from typing import List, Optional
 
@@ -31,6 +34,9 @@ if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# number of trailing output lines from a failed command to include in the error log
+_OUTPUT_TAIL_LINES = 200
+
 app = App(name="build-docs", help="Build Schola documentation (Doxygen -> Breathe -> Sphinx).")
 
 def _which(cmd: str) -> Optional[str]:
@@ -38,14 +44,78 @@ def _which(cmd: str) -> Optional[str]:
     return shutil.which(cmd)
 
 
-def _run(cmd: List[str], cwd: Optional[Path] = None):
-    """Run a subprocess command and raise on failure with helpful context."""
+def _drain(stream, tail: deque):
+    """Log each line of a subprocess's output at debug level, keeping the last lines in `tail`."""
+    for line in stream:
+        line = line.rstrip()
+        logger.debug("%s", line)
+        tail.append(line)
+
+
+def _run(cmd: List[str], cwd: Optional[Path] = None, input: Optional[str] = None):
+    """Run a subprocess command, optionally writing `input` to its stdin, and raise on failure with helpful context."""
     logger.info("Running: %s", " ".join(shlex.quote(p) for p in cmd))
-    try:
-        subprocess.run(cmd, check=True, cwd=(str(cwd) if cwd else None))
-    except subprocess.CalledProcessError as e:
-        logger.error("Command failed with exit code %s: %s", e.returncode, e.cmd)
-        raise
+    tail = deque(maxlen=_OUTPUT_TAIL_LINES)
+    with subprocess.Popen(
+        cmd,
+        cwd=(str(cwd) if cwd else None),
+        stdin=subprocess.PIPE if input is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    ) as proc:
+        # drain the output on a separate thread so a large input can't deadlock against a full output pipe
+        reader = threading.Thread(target=_drain, args=(proc.stdout, tail), daemon=True)
+        reader.start()
+        if input is not None:
+            proc.stdin.write(input)
+            proc.stdin.close()
+        reader.join()
+    if proc.returncode != 0:
+        logger.error("Command failed with exit code %s: %s\n%s", proc.returncode, cmd, "\n".join(tail))
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _doxygen_input_paths(doxyfile: Path) -> List[Path]:
+    """Return the paths listed in the INPUT tag of a Doxyfile, resolved relative to the Doxyfile."""
+    # join continuation lines so each tag is on a single line
+    text = doxyfile.read_text(encoding="utf-8").replace("\\\n", " ")
+    inputs: List[str] = []
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if not sep or key.lstrip().startswith("#"):
+            continue
+        key = key.strip()
+        if key == "INPUT":
+            inputs = value.split()
+        elif key.endswith("+") and key[:-1].strip() == "INPUT":
+            inputs += value.split()
+    return [doxyfile.parent / p.strip('"') for p in inputs]
+
+
+def _doxygen_needs_rebuild(doxyfile: Path, xml_dir: Path) -> bool:
+    """Return True if the Doxyfile or anything under its INPUT paths changed since the XML in `xml_dir` was generated.
+
+    Directories are checked as well as files, since deleting or renaming a file only updates the mtime of its directory.
+    """
+    index = xml_dir / "index.xml"
+    if not index.exists():
+        return True
+    inputs = _doxygen_input_paths(doxyfile)
+    if not inputs:
+        # an empty INPUT searches the working directory, which is not worth tracking
+        return True
+    generated = index.stat().st_mtime
+    if doxyfile.stat().st_mtime > generated:
+        return True
+    for path in inputs:
+        if not path.exists():
+            continue
+        entries = chain([path], path.rglob("*")) if path.is_dir() else [path]
+        if any(entry.stat().st_mtime > generated for entry in entries):
+            return True
+    return False
 
 @app.default
 def main(
@@ -55,6 +125,7 @@ def main(
     build_dir: Optional[Path] = None,
     clean: bool = False,
     sphinx_opts: str = "",
+    doxygen_threads: int = 0,
     verbose: bool = False,
 ):
     """
@@ -72,9 +143,11 @@ def main(
         Override output build directory. If not set, defaults to
         <plugin_folder>/Docs/Sphinx/_build/<builder>
     clean : bool
-        If True, remove the build_dir before building.
+        If True, remove the build_dir before building, and run Doxygen even if its sources are unchanged.
     sphinx_opts : str
         Extra options forwarded to sphinx-build (string will be split).
+    doxygen_threads : int
+        Number of threads Doxygen uses to parse the sources, overriding NUM_PROC_THREADS in the Doxyfile. 0 uses every core.
     verbose : bool
         Increase logging level.
     """
@@ -127,8 +200,13 @@ def main(
                 f"Doxygen config file not found at expected location: {doxygen_config}\n"
                 "Ensure Doxyfile exists or run doxygen manually to generate the xml."
             )
-        logger.info("Running Doxygen to generate XML (this writes to %s)", doxygen_xml)
-        _run([doxygen_cmd, str(doxygen_config)], cwd=doxygen_config.parent)
+        if clean or _doxygen_needs_rebuild(doxygen_config, doxygen_xml):
+            logger.info("Running Doxygen to generate XML (this writes to %s)", doxygen_xml)
+            # read the config from stdin so the thread count can be overridden without editing the Doxyfile
+            config = doxygen_config.read_text(encoding="utf-8") + f"\nNUM_PROC_THREADS = {doxygen_threads}\n"
+            _run([doxygen_cmd, "-"], cwd=doxygen_config.parent, input=config)
+        else:
+            logger.info("Doxygen sources unchanged since the last run. Reusing the XML in %s", doxygen_xml)
 
         if not breathe_apidoc_available:
             raise FileNotFoundError(
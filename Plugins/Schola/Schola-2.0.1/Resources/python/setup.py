@@ -74,7 +74,7 @@ if __name__ == "__main__":
         long_description=desc,
         long_description_content_type="text/markdown",
         install_requires=[
-            "protobuf>=3.20",
+            "protobuf>=4.21",
             "grpcio>=1.51.1",
             "onnx>=1.11, <1.16.2",
             "onnxscript",
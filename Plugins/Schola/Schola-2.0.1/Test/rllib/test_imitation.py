@@ -0,0 +1,61 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+"""Tests for reading expert data for imitation learning"""
+
+import json
+
+import numpy as np
+import pytest
+from schola.rllib.imitation import convert_to_rllib_format, read_expert_from_json, read_expert_from_jsonl
+
+
+def make_step(observations, actions):
+    return {
+        "observations": [{"interactorName": "sensor", "value": value} for value in observations],
+        "actions": [{"interactorName": "actuator", "value": value} for value in actions],
+    }
+
+
+def write_jsonl(path, steps):
+    path.write_text("".join(json.dumps(step) + "\n" for step in steps))
+    return path
+
+
+def test_read_expert_from_jsonl(tmp_path):
+    path = write_jsonl(
+        tmp_path / "expert.jsonl",
+        [make_step(["1,2", "3"], ["0.5"]), make_step(["4,5", "6"], ["1.5"])],
+    )
+    obs, acts = read_expert_from_jsonl(path)
+    np.testing.assert_array_equal(obs, [[1, 2, 3], [4, 5, 6]])
+    np.testing.assert_array_equal(acts, [[0.5], [1.5]])
+    assert obs.dtype == np.float32
+
+
+def test_read_expert_rejects_ragged_steps(tmp_path):
+    path = write_jsonl(
+        tmp_path / "expert.jsonl",
+        [make_step(["1,2,3"], ["0"]), make_step(["4,5,6,7,8"], ["0"])],
+    )
+    with pytest.raises(ValueError, match="step 1 has 5 observation values"):
+        read_expert_from_jsonl(path)
+
+
+def test_read_expert_without_steps(tmp_path):
+    path = write_jsonl(tmp_path / "expert.jsonl", [])
+    obs, acts = read_expert_from_jsonl(path)
+    assert obs.shape == (0, 0)
+    assert acts.shape == (0, 0)
+
+
+def test_read_expert_from_json_returns_step_pairs(tmp_path):
+    path = tmp_path / "expert.json"
+    path.write_text(json.dumps({"steps": [make_step(["0.1,2"], ["3"]), make_step(["4,5"], ["6"])]}))
+    assert read_expert_from_json(path) == [[[0.1, 2.0], [3.0]], [[4.0, 5.0], [6.0]]]
+
+
+def test_convert_empty_expert_to_rllib_format(tmp_path):
+    path = tmp_path / "expert.json"
+    path.write_text(json.dumps({"steps": []}))
+    output_path = convert_to_rllib_format(str(path), str(tmp_path / "rllib"))
+    with open(output_path) as f:
+        assert len(f.readlines()) == 1
@@ -0,0 +1,43 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+"""Tests for mixed precision training of SB3 algorithms"""
+
+import pytest
+import torch as th
+from stable_baselines3 import PPO, SAC
+from schola.sb3.amp import autocast_training
+
+
+@pytest.mark.parametrize("dtype", [th.bfloat16, th.float16])
+def test_ppo_autocast_training(dtype):
+    model = PPO("MlpPolicy", "CartPole-v1", n_steps=32, batch_size=16, n_epochs=1, device="cpu")
+    with autocast_training(model, dtype):
+        # collecting rollouts would fail on .numpy() if the policy outputs were not float32
+        model.learn(total_timesteps=64)
+    assert "evaluate_actions" not in vars(model.policy)
+    assert all(param.dtype == th.float32 for param in model.policy.parameters())
+
+
+def test_sac_autocast_training():
+    model = SAC("MlpPolicy", "Pendulum-v1", learning_starts=8, batch_size=8, buffer_size=64, device="cpu")
+    with autocast_training(model, th.bfloat16):
+        model.learn(total_timesteps=16)
+    assert "forward" not in vars(model.critic)
+    assert "action_log_prob" not in vars(model.actor)
+
+
+def test_fp16_restores_backward():
+    backward = th.Tensor.backward
+    model = PPO("MlpPolicy", "CartPole-v1", n_steps=32, batch_size=16, n_epochs=1, device="cpu")
+    with autocast_training(model, th.float16):
+        assert th.Tensor.backward is not backward
+    assert th.Tensor.backward is backward
+    assert "step" not in vars(model.policy.optimizer)
+
+
+def test_autocast_rollouts_with_bf16_weights():
+    model = PPO("MlpPolicy", "CartPole-v1", n_steps=32, batch_size=16, n_epochs=1, device="cpu")
+    # stands in for IPEX, which stores the weights in bf16
+    model.policy.to(th.bfloat16)
+    with autocast_training(model, th.bfloat16, include_rollouts=True):
+        model.learn(total_timesteps=64)
+    assert "forward" not in vars(model.policy)
@@ -0,0 +1,52 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+"""Tests for the SB3 rollout buffers"""
+
+import gymnasium as gym
+import numpy as np
+import torch as th
+from stable_baselines3.common.buffers import RolloutBuffer
+from schola.sb3.buffers import MemmapReplayBuffer, NumbaRolloutBuffer
+
+
+def fill_buffer(buffer, rng):
+    for _ in range(buffer.buffer_size):
+        buffer.add(
+            obs=rng.random((buffer.n_envs, 2), dtype=np.float32),
+            action=rng.random((buffer.n_envs, 1), dtype=np.float32),
+            reward=rng.random(buffer.n_envs, dtype=np.float32),
+            episode_start=rng.random(buffer.n_envs) < 0.2,
+            value=th.as_tensor(rng.random(buffer.n_envs, dtype=np.float32)),
+            log_prob=th.zeros(buffer.n_envs),
+        )
+
+
+def test_numba_gae_matches_rollout_buffer():
+    observation_space = gym.spaces.Box(-1, 1, (2,))
+    action_space = gym.spaces.Box(-1, 1, (1,))
+    buffers = [
+        buffer_class(16, observation_space, action_space, n_envs=3, gamma=0.99, gae_lambda=0.95)
+        for buffer_class in (RolloutBuffer, NumbaRolloutBuffer)
+    ]
+    last_values = th.as_tensor(np.random.default_rng(1).random(3, dtype=np.float32))
+    dones = np.array([True, False, True])
+    for buffer in buffers:
+        fill_buffer(buffer, np.random.default_rng(0))
+        buffer.compute_returns_and_advantage(last_values, dones)
+
+    expected, actual = buffers
+    np.testing.assert_allclose(actual.advantages, expected.advantages, rtol=1e-5)
+    np.testing.assert_allclose(actual.returns, expected.returns, rtol=1e-5)
+
+
+def test_memmap_replay_buffer(tmp_path):
+    observation_space = gym.spaces.Box(-1, 1, (2,))
+    action_space = gym.spaces.Box(-1, 1, (1,))
+    buffer = MemmapReplayBuffer(8, observation_space, action_space, n_envs=2, memmap_dir=str(tmp_path))
+    assert isinstance(buffer.observations, np.memmap)
+    assert isinstance(buffer.next_observations, np.memmap)
+
+    obs = np.ones((2, 2), dtype=np.float32)
+    buffer.add(obs, obs * 2, np.zeros((2, 1), dtype=np.float32), np.ones(2), np.zeros(2), [{}, {}])
+    np.testing.assert_array_equal(buffer.observations[0], obs)
+    np.testing.assert_array_equal(buffer.next_observations[0], obs * 2)
+    assert buffer.sample(4).observations.shape == (4, 2)
@@ -175,3 +175,24 @@ def test_export_sb3_policy_to_onnx(tmp_path, env_class, algo):
     save_model_as_onnx(model, tmp_path / "test.onnx")
 
     check_onnx_model(tmp_path / "test.onnx", env_class().observation_space, env_class().action_space)
+
+
+def test_export_onnx_falls_back_to_torchscript(tmp_path, monkeypatch, caplog):
+    import logging
+    import torch as th
+    from schola.core import model as schola_model
+
+    if not schola_model._ONNX_EXPORT_SUPPORTS_DYNAMO:
+        pytest.skip("torch.onnx.export has no Dynamo exporter")
+    torch_export = th.onnx.export
+
+    def failing_dynamo_export(*args, dynamo, **kwargs):
+        if dynamo:
+            raise th.onnx.errors.OnnxExporterError("unsupported")
+        return torch_export(*args, dynamo=dynamo, **kwargs)
+
+    monkeypatch.setattr(th.onnx, "export", failing_dynamo_export)
+    with caplog.at_level(logging.WARNING, logger=schola_model.__name__):
+        schola_model.export_onnx(th.nn.Linear(2, 1), (th.rand(1, 2),), tmp_path / "test.onnx", input_names=["obs"])
+    assert "falling back to the TorchScript exporter" in caplog.text
+    assert [input.name for input in onnx.load(tmp_path / "test.onnx").graph.input] == ["obs"]
@@ -301,6 +301,80 @@ def test_ppo_with_disable_eval(mock_main):
     assert args.disable_eval == True
 
 
+@patch('schola.scripts.sb3.train.main')
+def test_ppo_with_eval_episodes(mock_main):
+    """Test that the number of evaluation episodes is correctly parsed."""
+    command, bound, _ = app.parse_args([
+        'ppo',
+        '--eval-episodes', '25',
+    ], exit_on_error=False)
+    
+    command(*bound.args, **bound.kwargs)
+    
+    args = mock_main.call_args[0][0]
+    assert args.eval_episodes == 25
+
+
+@patch('schola.scripts.sb3.train.main')
+def test_ppo_with_compile_model(mock_main):
+    """Test that the torch.compile flags are correctly parsed."""
+    command, bound, _ = app.parse_args([
+        'ppo',
+        '--compile-model',
+        '--compile-mode', 'max-autotune',
+    ], exit_on_error=False)
+    
+    command(*bound.args, **bound.kwargs)
+    
+    args = mock_main.call_args[0][0]
+    assert args.compile_model == True
+    assert args.compile_mode == "max-autotune"
+
+
+@patch('schola.scripts.sb3.train.main')
+def test_ppo_with_ipex(mock_main):
+    """Test that the IPEX flags are correctly parsed."""
+    command, bound, _ = app.parse_args([
+        'ppo',
+        '--use-ipex',
+        '--ipex-dtype', 'bf16',
+    ], exit_on_error=False)
+    
+    command(*bound.args, **bound.kwargs)
+    
+    args = mock_main.call_args[0][0]
+    assert args.use_ipex == True
+    assert args.ipex_dtype == "bf16"
+
+
+@patch('schola.scripts.sb3.train.main')
+def test_ppo_with_mixed_precision(mock_main):
+    """Test that the mixed precision flag is correctly parsed."""
+    command, bound, _ = app.parse_args([
+        'ppo',
+        '--mixed-precision', 'bf16',
+    ], exit_on_error=False)
+    
+    command(*bound.args, **bound.kwargs)
+    
+    args = mock_main.call_args[0][0]
+    assert args.mixed_precision == "bf16"
+
+
+@patch('schola.scripts.sb3.train.main')
+def test_sac_with_replay_buffer_memmap_dir(mock_main, tmp_path):
+    """Test that the replay buffer memmap directory is correctly parsed."""
+    command, bound, _ = app.parse_args([
+        'sac',
+        '--replay-buffer-memmap-dir', str(tmp_path),
+    ], exit_on_error=False)
+    
+    command(*bound.args, **bound.kwargs)
+    
+    args = mock_main.call_args[0][0]
+    assert args.replay_buffer_memmap_dir == tmp_path
+
+
 @patch('schola.scripts.sb3.train.main')
 def test_sac_with_sde(mock_main):
     """Test SAC with state-dependent exploration arguments."""
@@ -88,3 +88,55 @@ def test_build_docs(
     assert (
         doc_source_path / "Sphinx" / "_build"
     ).exists(), "No built docs found from sphinx"
+
+
+def test_doxygen_needs_rebuild(tmp_path):
+    import os
+    from schola.scripts.utils.build_docs import _doxygen_needs_rebuild
+
+    source = tmp_path / "Source"
+    source.mkdir()
+    header = source / "A.h"
+    header.write_text("")
+    doxyfile = tmp_path / "Doxyfile"
+    doxyfile.write_text("# INPUT = ignored\nINPUT = Source \\\n        Missing\n")
+    xml_dir = tmp_path / "xml"
+    xml_dir.mkdir()
+
+    # no xml generated yet
+    assert _doxygen_needs_rebuild(doxyfile, xml_dir)
+
+    index = xml_dir / "index.xml"
+    index.write_text("")
+    os.utime(doxyfile, (0, 0))
+    os.utime(header, (0, 0))
+    os.utime(source, (0, 0))
+    assert not _doxygen_needs_rebuild(doxyfile, xml_dir)
+
+    # a source changed after the xml was generated
+    os.utime(header, (index.stat().st_mtime + 10,) * 2)
+    assert _doxygen_needs_rebuild(doxyfile, xml_dir)
+
+
+def test_doxygen_needs_rebuild_after_delete(tmp_path):
+    import os
+    from schola.scripts.utils.build_docs import _doxygen_needs_rebuild
+
+    source = tmp_path / "Source"
+    source.mkdir()
+    (source / "A.h").write_text("")
+    (source / "B.h").write_text("")
+    doxyfile = tmp_path / "Doxyfile"
+    doxyfile.write_text("INPUT = Source\n")
+    xml_dir = tmp_path / "xml"
+    xml_dir.mkdir()
+    index = xml_dir / "index.xml"
+    index.write_text("")
+    for path in (doxyfile, source, source / "A.h", source / "B.h"):
+        os.utime(path, (0, 0))
+    assert not _doxygen_needs_rebuild(doxyfile, xml_dir)
+
+    # deleting a header leaves every remaining file untouched, only the directory changes
+    (source / "B.h").unlink()
+    os.utime(source, (index.stat().st_mtime + 10,) * 2)
+    assert _doxygen_needs_rebuild(doxyfile, xml_dir)
@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
+
+
+import numpy as np
+import pytest
+from schola.core.utils.id_manager import IdManager, nested_get
+
+
+@pytest.fixture
+def id_manager():
+    return IdManager([["a", "b"], [], ["c"]])
+
+
+def test_flatten_list_of_dicts(id_manager):
+    assert id_manager.flatten_list_of_dicts([{"a": 1, "b": 2}, {}, {"c": 3}]) == [1, 2, 3]
+
+
+def test_flatten_list_of_dicts_out_of_order_and_missing(id_manager):
+    assert id_manager.flatten_list_of_dicts([{"b": 2}, {}, {}], default=0) == [0, 2, 0]
+
+
+def test_flatten_dict_of_dicts(id_manager):
+    assert id_manager.flatten_dict_of_dicts({2: {"c": 3}, 0: {"b": 2, "a": 1}}) == [1, 2, 3]
+
+
+def test_flatten_keeps_array_values(id_manager):
+    values = [np.zeros(3), np.ones(3), np.full(3, 2.0)]
+    output = id_manager.flatten_list_of_dicts(
+        [{"a": values[0], "b": values[1]}, {}, {"c": values[2]}]
+    )
+    assert all(out is value for out, value in zip(output, values))
+
+
+def test_nest_list_to_dict_of_dicts(id_manager):
+    assert id_manager.nest_list_to_dict_of_dicts([1, 2, 3]) == {
+        0: {"a": 1, "b": 2},
+        1: {},
+        2: {"c": 3},
+    }
+
+
+def test_nest_list_to_dict_of_dicts_missing_values(id_manager):
+    assert id_manager.nest_list_to_dict_of_dicts([1], default=0) == {
+        0: {"a": 1, "b": 0},
+        1: {},
+        2: {"c": 0},
+    }
+
+
+def test_nest_list_to_dict_of_dicts_too_many_values(id_manager):
+    with pytest.raises(IndexError):
+        id_manager.nest_list_to_dict_of_dicts([1, 2, 3, 4])
+
+
+def test_getitem(id_manager):
+    assert id_manager.num_ids == 3
+    assert id_manager[1] == (0, "b")
+    assert id_manager[2, "c"] == 2
+
+
+def test_nested_get():
+    dct = {"a": {"b": 1, "c": None}}
+    assert nested_get(dct, ["a", "b"], 0) == 1
+    assert nested_get(dct, ["a", "c"], 0) is None
+    assert nested_get(dct, ["a", "d"], 0) == 0
+    assert nested_get(dct, ["x", "b"], 0) == 0
@@ -1,8 +1,10 @@
 # Copyright (c) 2025 Advanced Micro Devices, Inc. All Rights Reserved.
 
 
+import os
+
 import pytest
-from schola.core.utils.ubt import UBTCommand
+from schola.core.utils.ubt import UBTCommand, get_engine_path_from_sln, get_project_file
 
 
 def test_default_ubt_command_args():
@@ -90,3 +92,29 @@ def test_specified_maps():
     assert (
         "-AllMaps" not in args
     ), "-AllMaps should not be included in UBT args when maps are specified"
+
+
+def test_get_project_file_tracks_folder_changes(tmp_path):
+    assert get_project_file(tmp_path) is None
+
+    project_file = tmp_path / "Project.uproject"
+    project_file.touch()
+    # bump the folder's modification time in case the filesystem timestamps are coarse
+    stat = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert get_project_file(tmp_path) == project_file
+
+
+def test_get_engine_path_from_sln_tracks_file_changes(tmp_path):
+    sln_file = tmp_path / "Project.sln"
+    entry = 'Project("{{GUID}}") = "UnrealBuildTool", "{}Engine/Source/Programs/UnrealBuildTool.csproj", "{{GUID}}"\n'
+    sln_file.write_text(entry.format("../UE_A/"))
+    assert get_engine_path_from_sln(sln_file).name == "UE_A"
+
+    sln_file.write_text(entry.format("../UE_B/"))
+    # bump the file's modification time in case the filesystem timestamps are coarse
+    stat = os.stat(sln_file)
+    os.utime(sln_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert get_engine_path_from_sln(sln_file).name == "UE_B"